@@ -0,0 +1,89 @@
+"""Measure /api/health latency while heavy uploads are in flight.
+
+Runs the API in-process over ASGI. Heavy clients keep posting
+sav/hijak.sav to /api/upload while a light client polls /api/health.
+Compares the worker pool with running the parse on the event loop, the
+way upload_save used to. Run from the repository root:
+
+    python benchmarks/bench_api_load.py
+"""
+
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import httpx
+
+import add_src  # noqa
+import api.main as api
+from api.workers import WorkerPool
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+HEAVY_CLIENTS = 8
+DURATION = 3.0  # seconds
+POLL_INTERVAL = 0.005  # seconds
+
+
+class InlinePool:
+    """Runs jobs directly on the event loop, as before the worker pool."""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+async def heavy_client(client: httpx.AsyncClient, deadline: float, codes: list):
+    contents = SAV_PATH.read_bytes()
+    while time.perf_counter() < deadline:
+        files = {"save_file": ("hijak.sav", contents)}
+        response = await client.post("/api/upload", files=files)
+        codes.append(response.status_code)
+        if response.status_code == 503:
+            await asyncio.sleep(0.01)
+
+
+async def light_client(client: httpx.AsyncClient, deadline: float) -> list[float]:
+    latencies = []
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get("/api/health")
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(POLL_INTERVAL)
+    return latencies
+
+
+async def scenario(pool) -> tuple[list[float], list[int]]:
+    api.pool = pool
+    transport = httpx.ASGITransport(app=api.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        deadline = time.perf_counter() + DURATION
+        codes: list[int] = []
+        heavy = [heavy_client(client, deadline, codes) for _ in range(HEAVY_CLIENTS)]
+        results = await asyncio.gather(light_client(client, deadline), *heavy)
+    return results[0], codes
+
+
+def report(name: str, latencies: list[float], codes: list[int]) -> None:
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered) * 1e3
+    p99 = ordered[int(0.99 * (len(ordered) - 1))] * 1e3
+    print(
+        f"{name:<16}{len(ordered):>8}{p50:>9.1f} ms{p99:>9.1f} ms"
+        f"{codes.count(200):>8}{codes.count(503):>8}"
+    )
+
+
+async def main():
+    print(f"{HEAVY_CLIENTS} heavy clients for {DURATION:.0f} s")
+    print(f"{'':<16}{'polls':>8}{'p50':>12}{'p99':>12}{'200s':>8}{'503s':>8}")
+
+    report("inline", *await scenario(InlinePool()))
+    for kind in ("thread", "process"):
+        pool = WorkerPool(kind=kind)
+        await pool.warm_up()
+        report(f"{kind} pool", *await scenario(pool))
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""Measure /api/batch-upload throughput against the number of workers.
+
+Builds a corpus by cycling the saves in sav/ into one zip, posts it to the
+batch endpoint over ASGI, and times until the last result line arrives.
+Each worker count gets a warmed process pool; one-by-one posts of the same
+saves to /api/upload are the baseline. Run from the repository root:
+
+    python benchmarks/bench_batch_upload.py
+"""
+
+import asyncio
+import io
+import itertools
+import os
+import time
+import zipfile
+from pathlib import Path
+
+import httpx
+
+import add_src  # noqa
+import api.main as api
+from api.workers import WorkerPool
+
+SAV_DIR = Path(__file__).parent.parent / "sav"
+CORPUS_SIZE = 48
+WORKER_COUNTS = (1, 2, 4)
+RUNS = 3
+
+
+def build_corpus() -> bytes:
+    """Zip CORPUS_SIZE saves, cycling through the fixtures in sav/."""
+    saves = sorted(SAV_DIR.glob("*.sav"))
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for i, path in zip(range(CORPUS_SIZE), itertools.cycle(saves)):
+            archive.writestr(f"{i:03}_{path.name}", path.read_bytes())
+    return buf.getvalue()
+
+
+def client() -> httpx.AsyncClient:
+    transport = httpx.ASGITransport(app=api.app)
+    return httpx.AsyncClient(transport=transport, base_url="http://api")
+
+
+async def post_batch(corpus: bytes) -> tuple[float, int]:
+    """Seconds until every result line has arrived, and the number of errors."""
+    async with client() as http:
+        start = time.perf_counter()
+        files = {"files": ("corpus.zip", corpus)}
+        response = await http.post("/api/batch-upload", files=files)
+        lines = response.text.splitlines()
+        assert len(lines) == CORPUS_SIZE
+        errors = sum('"error"' in line for line in lines)
+        return time.perf_counter() - start, errors
+
+
+async def post_one_by_one(corpus: bytes) -> tuple[float, int]:
+    """The same saves, posted to /api/upload one request at a time."""
+    with zipfile.ZipFile(io.BytesIO(corpus)) as archive:
+        saves = [(name, archive.read(name)) for name in archive.namelist()]
+
+    async with client() as http:
+        start = time.perf_counter()
+        errors = 0
+        for name, contents in saves:
+            response = await http.post(
+                "/api/upload", files={"save_file": (name, contents)}
+            )
+            errors += response.status_code != 200
+        return time.perf_counter() - start, errors
+
+
+def report(name: str, total: float, errors: int) -> None:
+    print(f"{name:<14}{total * 1e3:>7.0f} ms{CORPUS_SIZE / total:>10.1f}{errors:>8}")
+
+
+async def main():
+    corpus = build_corpus()
+    print(f"{CORPUS_SIZE} saves, {len(corpus) / 1024:.0f} KiB zipped, ", end="")
+    print(f"{os.cpu_count()} CPUs")
+    print(f"{'':<14}{'total':>10}{'saves/s':>10}{'errors':>8}")
+
+    api.pool = WorkerPool(kind="process", workers=1)
+    await api.pool.warm_up()
+    report("one by one", *min([await post_one_by_one(corpus) for _ in range(RUNS)]))
+    api.pool.shutdown()
+
+    for workers in WORKER_COUNTS:
+        api.pool = WorkerPool(kind="process", workers=workers)
+        await api.pool.warm_up()
+        runs = [await post_batch(corpus) for _ in range(RUNS)]
+        report(f"{workers} workers", *min(runs))
+        api.pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+"""Compare per-mon box parsing with the bulk structured-dtype decoder.
+
+The storage is filled to all 750 slots by repeating the mons found in
+sav/hijak.sav. Run from the repository root:
+
+    python benchmarks/bench_box_decode.py
+"""
+
+import timeit
+from pathlib import Path
+
+import add_src  # noqa
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor
+from pokemon_parser import BoxPokemonParser
+from bulk_decoder import BoxStorageDecoder
+from utils import split_into_chunks
+from constants import BOX_MON_TOTAL, BOXMON_SIZE
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+RUNS = 50
+
+
+def full_storage() -> bytes:
+    save = SaveFile(SAV_PATH.read_bytes())
+    extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    mons = [bytes(mon) for mon in extractor.pokemon_in_storage]
+    return b"".join(mons[i % len(mons)] for i in range(BOX_MON_TOTAL))
+
+
+def main():
+    storage = full_storage()
+    parser = BoxPokemonParser()
+    decoder = BoxStorageDecoder()
+
+    def per_mon():
+        return [parser.parse(c) for c in split_into_chunks(storage, BOXMON_SIZE)]
+
+    timings = {
+        "parse() per mon": lambda: per_mon(),
+        "BoxStorageDecoder.decode": lambda: decoder.decode(storage),
+        "parse_storage()": lambda: parser.parse_storage(storage),
+    }
+
+    print(f"{BOX_MON_TOTAL} slots, best of {RUNS} runs")
+    for name, fn in timings.items():
+        best = min(timeit.repeat(fn, number=1, repeat=RUNS))
+        print(f"{name:<28}{best * 1e6:>12,.0f} us")
+
+
+if __name__ == "__main__":
+    main()
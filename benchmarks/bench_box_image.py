@@ -0,0 +1,60 @@
+"""Time rendering a full PC storage sheet against the number of workers.
+
+The storage is filled to all 750 slots by repeating the mons found in
+sav/hijak.sav, and sprites are synthetic and packed into a temporary
+sprite atlas, so nothing is downloaded. Run from the repository root:
+
+    python benchmarks/bench_box_image.py
+"""
+
+import os
+import tempfile
+import timeit
+from pathlib import Path
+
+import add_src  # noqa
+from box_renderer import BoxImageRenderer
+from pokemon_parser import BoxPokemonParser
+from utils import iter_chunks
+from constants import BOXMON_SIZE
+from bench_box_decode import full_storage
+from bench_sprite_background import synthetic_sprites
+from bench_team_image import offline_formatter
+
+RUNS = 3
+WORKER_COUNTS = [1, 2, 4, 8]
+
+
+def main():
+    parser = BoxPokemonParser()
+    slots = {
+        slot: parser.parse(record)
+        for slot, record in enumerate(
+            iter_chunks(full_storage(), BOXMON_SIZE, skip_empty=False)
+        )
+    }
+    # One mon per species is enough to pack every sprite
+    mons = list({mon.species_id: mon for mon in slots.values()}.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        formatter = offline_formatter(Path(tmp), mons, synthetic_sprites(len(mons)))
+
+        print(f"{len(slots)} slots on one sheet, {os.cpu_count()} CPUs")
+        for workers in WORKER_COUNTS:
+            renderer = BoxImageRenderer(formatter, workers=workers)
+
+            def cold():
+                renderer.tile_cache.clear()
+                renderer.render_sheet(slots)
+
+            best = min(timeit.repeat(cold, number=1, repeat=RUNS))
+            print(f"{workers:>2} workers{best * 1e3:>12,.0f} ms")
+
+        warm = min(
+            timeit.repeat(lambda: renderer.render_sheet(slots), number=1, repeat=RUNS)
+        )
+        print(f"{'cached tiles':<10}{warm * 1e3:>12,.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Cold-start time of the text-only export path, in a fresh process each run.
+
+Run from the repository root:
+
+    python benchmarks/bench_cold_start.py
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+RUNS = 10
+
+EXPORT = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, "src")
+from save_file import SaveFile
+from pokemon_extractor import PartyPokemonExtractor, BoxPokemonExtractor
+from pokemon_parser import PartyPokemonParser, BoxPokemonParser
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+imported = time.perf_counter()
+
+save = SaveFile(open("sav/hijak.sav", "rb").read())
+party = [
+    PartyPokemonParser().parse(p)
+    for p in PartyPokemonExtractor(save.active_block).pokemon_in_party
+]
+box = [
+    BoxPokemonParser().parse(p)
+    for p in BoxPokemonExtractor(save.active_block, save.expanded_block).pokemon_in_storage
+]
+formatter = ShowdownFormatter(GameDataManager())
+text = "\\n".join(formatter.format(mon) for mon in party + box)
+done = time.perf_counter()
+print(imported - start, done - imported)
+"""
+
+
+def main():
+    imports, exports = [], []
+    for _ in range(RUNS):
+        out = subprocess.run(
+            [sys.executable, "-c", EXPORT], cwd=ROOT, capture_output=True, text=True
+        ).stdout.split()
+        imports.append(float(out[0]))
+        exports.append(float(out[1]))
+
+    print(f"best of {RUNS} fresh processes")
+    print(f"{'imports':<24}{min(imports) * 1e3:>10.1f} ms")
+    print(f"{'first export (data load)':<24}{min(exports) * 1e3:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Compare per-mon Showdown formatting with the bulk columnar exporter.
+
+Uses every fixture in sav/ plus a storage filled to all 750 slots by
+repeating the mons found in sav/hijak.sav. Run from the repository root:
+
+    python benchmarks/bench_export.py
+"""
+
+import timeit
+from pathlib import Path
+
+import add_src  # noqa
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor
+from pokemon_parser import BoxPokemonParser
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+from bench_box_decode import full_storage
+
+SAV_DIR = Path(__file__).parent.parent / "sav"
+RUNS = 20
+
+
+def storages() -> dict[str, bytes]:
+    found = {"750 slots": full_storage()}
+    for path in sorted(SAV_DIR.glob("*.sav")):
+        save = SaveFile(path.read_bytes())
+        extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+        found[path.name] = extractor.storage_bytes
+    return found
+
+
+def main():
+    parser = BoxPokemonParser()
+    formatter = ShowdownFormatter(GameDataManager(), export_level=50)
+
+    for name, storage in storages().items():
+        table = parser.parse_table(storage)
+        if not len(table):
+            continue
+
+        timings = {
+            "_format() per mon": lambda: [formatter._format(mon) for mon in table],
+            "export_table()": lambda: formatter.export_table(table),
+        }
+
+        print(f"{name}: {len(table)} mons, best of {RUNS} runs")
+        for label, fn in timings.items():
+            best = min(timeit.repeat(fn, number=1, repeat=RUNS))
+            print(f"  {label:<22}{len(table) / best:>12,.0f} mons/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compare encode time and output size of the image encodings.
+
+Encodes a team image and a full PC storage sheet drawn with flat-colour
+pixel-art sprites from a temporary sprite atlas. Run from the repository
+root:
+
+    python benchmarks/bench_image_encoding.py
+"""
+
+import tempfile
+import timeit
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import add_src  # noqa
+from box_renderer import BoxImageRenderer, parse_storage_slots
+from image_encoding import ENCODINGS
+from pokemon_extractor import BoxPokemonExtractor
+from save_file import SaveFile
+from bench_team_image import SAV_PATH, hijak_party, offline_formatter
+
+RUNS = 5
+
+
+def pixel_art_sprites(count: int) -> list[Image.Image]:
+    """96x96 sprites of 8x8 blocks in a handful of flat colours."""
+    rng = np.random.default_rng(0)
+    sprites = []
+    for _ in range(count):
+        palette = rng.integers(0, 256, (6, 4), dtype=np.uint8)
+        palette[:, 3] = 255
+        palette[0] = (255, 255, 255, 255)  # background
+        blocks = np.zeros((12, 12), dtype=np.intp)
+        blocks[2:10, 2:10] = rng.integers(1, len(palette), (8, 8))
+        pixels = palette[np.kron(blocks, np.ones((8, 8), dtype=np.intp))]
+        sprites.append(Image.fromarray(pixels, "RGBA"))
+    return sprites
+
+
+def main():
+    party = hijak_party()
+    save = SaveFile(SAV_PATH.read_bytes())
+    slots = parse_storage_slots(
+        BoxPokemonExtractor(save.active_block, save.expanded_block)
+    )
+    mons = party + list(slots.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        formatter = offline_formatter(Path(tmp), mons, pixel_art_sprites(len(mons)))
+        images = {
+            "team image": formatter.format_image(party),
+            "storage sheet": BoxImageRenderer(formatter).render_sheet(slots),
+        }
+
+    for name, img in images.items():
+        print(f"{name} {img.size[0]}x{img.size[1]}, best of {RUNS} runs")
+        print(f"  {'encoding':<14}{'encode':>12}{'size':>12}")
+        for label, encoding in ENCODINGS.items():
+            best = min(
+                timeit.repeat(lambda: encoding.encode(img), number=1, repeat=RUNS)
+            )
+            size = len(encoding.encode(img).getvalue())
+            print(f"  {label:<14}{best * 1e3:>9,.1f} ms{size / 1024:>9,.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Measure allocations made while building a SaveFile.
+
+Run from the repository root:
+
+    python benchmarks/bench_save_file.py
+"""
+
+import tracemalloc
+from pathlib import Path
+
+import add_src  # noqa
+from save_file import SaveFile
+from pokemon_extractor import PartyPokemonExtractor, BoxPokemonExtractor
+
+SAV_DIR = Path(__file__).parent.parent / "sav"
+
+
+def measure(raw: bytes) -> tuple[int, int]:
+    """Return (bytes allocated, peak bytes) for one SaveFile and its extractors."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+
+    save = SaveFile(raw)
+    party = PartyPokemonExtractor(save.active_block).pokemon_in_party
+    box = BoxPokemonExtractor(
+        save.active_block, save.expanded_block
+    ).pokemon_in_storage
+
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del save, party, box
+    return after - before, peak - before
+
+
+def main():
+    print(f"{'save':<16}{'retained (B)':>14}{'peak (B)':>14}")
+    for path in sorted(SAV_DIR.glob("*.sav")):
+        raw = path.read_bytes()
+        retained, peak = measure(raw)
+        print(f"{path.name:<16}{retained:>14,}{peak:>14,}")
+
+
+if __name__ == "__main__":
+    main()
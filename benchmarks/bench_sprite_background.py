@@ -0,0 +1,81 @@
+"""Time sprite background removal per sprite.
+
+Compares the NumPy remove_background with the previous per-pixel loop on
+96x96 sprites, or on every PNG in a sprite directory if one is given.
+Run from the repository root:
+
+    python benchmarks/bench_sprite_background.py [sprite directory]
+"""
+
+import sys
+import timeit
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+import add_src  # noqa
+from sprite_store import remove_background
+
+RUNS = 20
+
+
+def remove_background_loop(sprite: Image.Image) -> Image.Image:
+    """The per-pixel getpixel / Counter / putdata version, for reference."""
+    width, height = sprite.size
+    border_pixels = []
+    for border_y in range(height):
+        border_pixels.append(sprite.getpixel((0, border_y)))
+        border_pixels.append(sprite.getpixel((width - 1, border_y)))
+    for border_x in range(width):
+        border_pixels.append(sprite.getpixel((border_x, 0)))
+        border_pixels.append(sprite.getpixel((border_x, height - 1)))
+
+    bg_color = Counter(border_pixels).most_common(1)[0][0]
+
+    new_data = []
+    for item in sprite.getdata():
+        if item[:3] == bg_color[:3]:
+            new_data.append((0, 0, 0, 0))
+        else:
+            new_data.append(item)
+    sprite.putdata(new_data)
+    return sprite
+
+
+def synthetic_sprites(count: int = 6) -> list[Image.Image]:
+    """96x96 sprites with a flat background and a noisy blob in the middle."""
+    rng = np.random.default_rng(0)
+    sprites = []
+    for _ in range(count):
+        pixels = np.full((96, 96, 4), (255, 255, 255, 255), dtype=np.uint8)
+        pixels[16:80, 16:80] = rng.integers(0, 256, (64, 64, 4), dtype=np.uint8)
+        sprites.append(Image.fromarray(pixels, "RGBA"))
+    return sprites
+
+
+def main():
+    if len(sys.argv) > 1:
+        paths = sorted(Path(sys.argv[1]).glob("*.png"))
+        sprites = [Image.open(path).convert("RGBA") for path in paths]
+    else:
+        sprites = synthetic_sprites()
+
+    for sprite in sprites:
+        expected = np.array(remove_background_loop(sprite.copy()))
+        assert (np.array(remove_background(sprite)) == expected).all()
+
+    timings = {
+        "per-pixel loop": lambda: [remove_background_loop(s.copy()) for s in sprites],
+        "remove_background": lambda: [remove_background(s) for s in sprites],
+    }
+
+    print(f"{len(sprites)} sprites, best of {RUNS} runs")
+    for name, fn in timings.items():
+        best = min(timeit.repeat(fn, number=1, repeat=RUNS))
+        print(f"{name:<22}{best / len(sprites) * 1e6:>12,.0f} us/sprite")
+
+
+if __name__ == "__main__":
+    main()
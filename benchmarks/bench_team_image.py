@@ -0,0 +1,70 @@
+"""Time team image rendering per mon card.
+
+Sprites are synthetic and packed into a temporary sprite atlas, so nothing
+is downloaded and the timing covers compositing and text only. Run from
+the repository root:
+
+    python benchmarks/bench_team_image.py
+"""
+
+import tempfile
+import timeit
+from pathlib import Path
+
+import add_src  # noqa
+from save_file import SaveFile
+from pokemon_extractor import PartyPokemonExtractor
+from pokemon_parser import PartyPokemonParser
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+from sprite_store import SpriteStore
+from sprite_atlas import SpriteAtlas, build_atlas
+from bench_sprite_background import synthetic_sprites
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+RUNS = 20
+
+
+def hijak_party() -> list:
+    save = SaveFile(SAV_PATH.read_bytes())
+    records = PartyPokemonExtractor(save.active_block).iter_party()
+    return list(PartyPokemonParser().iter_parse(records))
+
+
+def offline_formatter(tmp: Path, mons: list, sprites: list) -> ShowdownFormatter:
+    """A formatter drawing the given sprites from an atlas built under tmp."""
+    pack = tmp / "pack"
+    pack.mkdir()
+    for mon, sprite in zip(mons, sprites):
+        sprite.save(pack / f"{mon.species_id}.png")
+
+    store = SpriteStore(cache_dir=tmp / "cache", allow_network=False)
+    store.prefill(pack)
+    species_count = max(mon.species_id for mon in mons) + 1
+    build_atlas(species_count, store, tmp / "atlas.npy", tmp / "meta.npy")
+
+    formatter = ShowdownFormatter(GameDataManager())
+    formatter.sprite_store = store
+    formatter.sprite_atlas = SpriteAtlas(tmp / "atlas.npy", tmp / "meta.npy")
+    return formatter
+
+
+def main():
+    party = hijak_party()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sprites = synthetic_sprites(len(party))
+        formatter = offline_formatter(Path(tmp), party, sprites)
+
+        cold = timeit.timeit(lambda: formatter.format_image(party), number=1)
+        warm = min(
+            timeit.repeat(lambda: formatter.format_image(party), number=1, repeat=RUNS)
+        )
+
+    print(f"{len(party)} cards, best of {RUNS} runs")
+    print(f"{'first render':<22}{cold / len(party) * 1e6:>12,.0f} us/card")
+    print(f"{'warm render':<22}{warm / len(party) * 1e6:>12,.0f} us/card")
+
+
+if __name__ == "__main__":
+    main()
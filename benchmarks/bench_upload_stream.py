@@ -0,0 +1,143 @@
+"""Compare the JSON and streaming NDJSON responses of /api/upload.
+
+Drives the ASGI app directly, so the time to the first body chunk is what
+the server sends rather than what a client buffers. Peak memory is traced
+with tracemalloc around each request, with the parse on a thread pool so
+it is traced too. Result and format caches are cleared before every run.
+Uses sav/hijak.sav and a copy with the storage filled to all 750 slots.
+Run from the repository root:
+
+    python benchmarks/bench_upload_stream.py
+"""
+
+import asyncio
+import time
+import tracemalloc
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+import add_src  # noqa
+import api.main as api
+from api.workers import WorkerPool
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor
+from showdown_formatter import ShowdownFormatter
+from constants import CHECKSUM_OFFSET, SAVE_SECTION_SIZE, SECTION_CHECKSUM_SIZES
+from constants import SECTION_ID_OFFSET
+from bench_box_decode import full_storage
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+RUNS = 10
+
+
+def full_save() -> bytes:
+    """hijak.sav with every box slot filled and the checksums fixed up."""
+    raw = bytearray(SAV_PATH.read_bytes())
+    save = SaveFile(raw)
+    extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+
+    storage = full_storage()
+    offset = 0
+    for region in extractor.box_regions():
+        region[:] = storage[offset : offset + len(region)]
+        offset += len(region)
+
+    block = save.active_block.raw_bytes
+    for start in range(0, len(block), SAVE_SECTION_SIZE):
+        section = block[start : start + SAVE_SECTION_SIZE]
+        section_id = int.from_bytes(section[slice(*SECTION_ID_OFFSET)], "little")
+        if section_id not in SECTION_CHECKSUM_SIZES:
+            continue
+        size = SECTION_CHECKSUM_SIZES[section_id]
+        total = int(np.frombuffer(section[:size], "<u4").sum()) & 0xFFFFFFFF
+        checksum = ((total >> 16) + (total & 0xFFFF)) & 0xFFFF
+        section[slice(*CHECKSUM_OFFSET)] = checksum.to_bytes(2, "little")
+
+    SaveFile(raw, verify_checksums=True)
+    return bytes(raw)
+
+
+async def request(contents: bytes, stream: bool) -> tuple[float, float, int]:
+    """Seconds to the first body byte and to the last, and body length."""
+    upload = httpx.Request(
+        "POST",
+        f"http://api/api/upload?stream={str(stream).lower()}",
+        files={"save_file": ("save.sav", contents)},
+    )
+    body = upload.read()
+    scope = {
+        "type": "http",
+        # 2.4 servers report disconnects on send, so nothing polls receive
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/api/upload",
+        "raw_path": b"/api/upload",
+        "query_string": upload.url.query,
+        "root_path": "",
+        "headers": [(k.lower(), v) for k, v in upload.headers.raw],
+        "server": ("api", 80),
+        "client": ("bench", 1),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    first = None
+    length = 0
+
+    async def send(message):
+        nonlocal first, length
+        if message["type"] == "http.response.body" and message.get("body"):
+            first = first or time.perf_counter() - start
+            length += len(message["body"])
+
+    start = time.perf_counter()
+    await api.app(scope, receive, send)
+    return first, time.perf_counter() - start, length
+
+
+async def measure(contents: bytes, stream: bool) -> tuple[float, float, int, int]:
+    """Best first-byte and total times, the body length and peak traced bytes."""
+    timings = []
+    for _ in range(RUNS):
+        api.result_cache.clear()
+        ShowdownFormatter.format_cache.clear()
+        timings.append(await request(contents, stream))
+
+    api.result_cache.clear()
+    ShowdownFormatter.format_cache.clear()
+    tracemalloc.start()
+    await request(contents, stream)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    first = min(t[0] for t in timings)
+    total = min(t[1] for t in timings)
+    return first, total, timings[0][2], peak
+
+
+async def main():
+    api.pool = WorkerPool(kind="thread", workers=1)
+    await api.pool.warm_up()
+
+    saves = {"hijak.sav": SAV_PATH.read_bytes(), "750 slots": full_save()}
+    print(f"best of {RUNS} runs, caches cleared")
+    print(f"{'':<22}{'first byte':>12}{'total':>10}{'body':>10}{'peak memory':>14}")
+    for name, contents in saves.items():
+        for stream in (False, True):
+            first, total, length, peak = await measure(contents, stream)
+            label = f"{name} {'ndjson' if stream else 'json'}"
+            print(
+                f"{label:<22}{first * 1e3:>9.1f} ms{total * 1e3:>7.1f} ms"
+                f"{length / 1024:>7.0f} KB{peak / 1024:>11.0f} KB"
+            )
+
+    api.pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,60 @@
-from fastapi import FastAPI, UploadFile, HTTPException
+import json
+import os
+import zipfile
+from contextlib import asynccontextmanager
+from io import BytesIO
+from fastapi import FastAPI, Header, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from save_file import SaveFile
-from pokemon_extractor import PartyPokemonExtractor, BoxPokemonExtractor
-from pokemon_parser import PartyPokemonParser, BoxPokemonParser
+from fastapi.responses import Response, StreamingResponse
+from cache import LRUCache
+from save_file import SaveFile, save_digest
 from showdown_formatter import ShowdownFormatter
 from data_manager import GameDataManager
+from export_pipeline import stream_ndjson, stream_showdown_bytes
+from image_encoding import get_encoding
+from api.workers import PoolBusy, WorkerPool
+from api.workers import parse_upload, render_team_image, verify_save
+
+# Parsing and rendering run here, never on the event loop
+pool = WorkerPool.from_env()
+
+# Seconds a client should wait before retrying when the pool is full
+RETRY_AFTER = 1
+
+SAVE_EXTENSIONS = (".sav", ".sa2", ".sa3", ".sa4")
+
+# Encoded /api/upload results keyed by (save digest, export level)
+result_cache = LRUCache(
+    maxsize=1024,
+    max_bytes=int(os.environ.get("API_RESULT_CACHE_MB", 64)) * 1024 * 1024,
+    sizeof=len,
+)
+
+# Encoded team images and their media types, keyed by (save digest,
+# export level, encoding)
+image_cache = LRUCache(
+    maxsize=256,
+    max_bytes=int(os.environ.get("API_IMAGE_CACHE_MB", 64)) * 1024 * 1024,
+    sizeof=lambda entry: len(entry[0]),
+)
+
+# Team images only change with the save and options, which the URL names
+IMAGE_CACHE_CONTROL = "public, max-age=86400"
+
+# Limits for batch uploads, so a zip can't expand without bound
+MAX_BATCH_FILES = 256
+MAX_SAVE_SIZE = 256 * 1024
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await pool.warm_up()
+    yield
+    pool.shutdown()
+
 
 # Create the FastAPI app
-app = FastAPI(title="RR Pokemon Exporter")
+app = FastAPI(title="RR Pokemon Exporter", lifespan=lifespan)
 
 # Allow requests from our frontend
 app.add_middleware(
@@ -19,47 +66,310 @@ app.add_middleware(
 )
 
 
-@app.post("/api/upload")
-async def upload_save(save_file: UploadFile):
-    """Handle save file upload and return parsed Pokémon data"""
-    if not any(save_file.filename.endswith(ext) for ext in [".sav", ".sa2", ".sa3", ".sa4"]):
+async def read_upload(save_file: UploadFile) -> bytes:
+    """Read an uploaded save, rejecting bad file types"""
+    if not save_file.filename.endswith(SAVE_EXTENSIONS):
         raise HTTPException(
             status_code=400, detail="Invalid file type. Please upload a .sav file"
         )
 
+    # Read the uploaded file
+    return await save_file.read()
+
+
+async def read_save(save_file: UploadFile) -> SaveFile:
+    """Read an uploaded save, rejecting bad file types and corrupt saves"""
+    contents = await read_upload(save_file)
+
+    # Reject truncated or corrupt saves before doing any parsing
+    await run_job(verify_save, contents)
+    return SaveFile(contents)
+
+
+def read_digest(contents: bytes) -> str:
+    """Content hash of an uploaded save, rejecting unexpected sizes"""
     try:
-        # Read the uploaded file
-        contents = await save_file.read()
-
-        # Create SaveFile instance
-        save = SaveFile(contents)
-
-        # Extract party Pokémon
-        party_extractor = PartyPokemonExtractor(save.active_block)
-        party_parser = PartyPokemonParser()
-        party_pokemon = [
-            party_parser.parse(pokemon) for pokemon in party_extractor.pokemon_in_party
-        ]
-
-        # Extract box Pokémon
-        box_extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
-        box_parser = BoxPokemonParser()
-        box_pokemon = [
-            box_parser.parse(pokemon) for pokemon in box_extractor.pokemon_in_storage
-        ]
-
-        # Format everything for Showdown
-        formatter = ShowdownFormatter(GameDataManager())
-
-        return {
-            "party": [formatter.format(mon) for mon in party_pokemon],
-            "box": [formatter.format(mon) for mon in box_pokemon],
-        }
+        return save_digest(contents)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def server_busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": str(RETRY_AFTER)},
+    )
 
+
+async def run_job(fn, *args):
+    """Run a CPU-bound job on the worker pool, mapping failures to HTTP errors"""
+    try:
+        return await pool.run(fn, *args)
+    except PoolBusy:
+        raise server_busy()
+    except ValueError as e:
+        # Truncated or corrupt saves
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+class PooledStreamingResponse(StreamingResponse):
+    """
+    A response formatted as it streams, which holds a worker pool slot until
+    it has been sent, so streams count against the pool's capacity too.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            pool.release()
+
+
+async def pooled_stream(content, **kwargs) -> PooledStreamingResponse:
+    try:
+        await pool.acquire()
+    except PoolBusy:
+        raise server_busy()
+    return PooledStreamingResponse(content, **kwargs)
+
+
+def make_etag(digest: str, *options) -> str:
+    """Results only depend on the save and the options, so they never go stale"""
+    return '"' + "-".join([digest, *(str(o) for o in options if o is not None)]) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Only meaningful once the representation is known to exist, as * matches any"""
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags or "*" in tags
+
+
+@app.post("/api/upload")
+async def upload_save(
+    save_file: UploadFile, export_level: int | None = None, stream: bool = False
+):
+    """
+    Handle save file upload and return parsed Pokémon data. With stream,
+    send one JSON line per mon as it is formatted instead, with its party
+    slot or box and slot.
+    """
+    contents = await read_upload(save_file)
+    digest = read_digest(contents)
+
+    if stream:
+        await run_job(verify_save, contents)
+        formatter = ShowdownFormatter(GameDataManager(), export_level)
+        return await pooled_stream(
+            stream_ndjson(SaveFile(contents), formatter),
+            media_type="application/x-ndjson",
+            headers={"ETag": make_etag(digest, export_level, "ndjson")},
+        )
+
+    key = (digest, export_level)
+    body = result_cache.get(key)
+    if body is None:
+        result = await run_job(parse_upload, contents, export_level)
+        body = json.dumps(result, ensure_ascii=False).encode()
+        result_cache.put(key, body)
+
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"ETag": make_etag(digest, export_level)},
+    )
+
+
+@app.get("/api/export/{digest}")
+async def cached_export(
+    digest: str,
+    export_level: int | None = None,
+    if_none_match: str | None = Header(default=None),
+):
+    """Fetch the result of an earlier upload by its save digest"""
+    body = result_cache.get((digest, export_level))
+    if body is None:
+        raise HTTPException(
+            status_code=404, detail="No cached result for this save, upload it again"
+        )
+
+    etag = make_etag(digest, export_level)
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+async def read_batch(files: list[UploadFile]) -> list[tuple[str, bytes | str]]:
+    """
+    (filename, contents) for every save in a batch, with zips expanded.
+    Files that can't be used get an error message instead of contents.
+    """
+    too_many = HTTPException(
+        status_code=413, detail=f"Batches are limited to {MAX_BATCH_FILES} saves"
+    )
+
+    saves = []
+    for upload in files:
+        contents = await upload.read()
+        if not upload.filename.endswith(".zip"):
+            saves.append((upload.filename, contents))
+            continue
+
+        try:
+            with zipfile.ZipFile(BytesIO(contents)) as archive:
+                for info in archive.infolist():
+                    if info.is_dir():
+                        continue
+                    # Checked before decompressing anything
+                    if len(saves) >= MAX_BATCH_FILES:
+                        raise too_many
+                    if info.file_size > MAX_SAVE_SIZE:
+                        saves.append((info.filename, "File is too large for a save"))
+                    else:
+                        saves.append((info.filename, archive.read(info)))
+        except zipfile.BadZipFile as e:
+            saves.append((upload.filename, f"Invalid zip file: {e}"))
+
+    if len(saves) > MAX_BATCH_FILES:
+        raise too_many
+
+    for i, (filename, contents) in enumerate(saves):
+        if isinstance(contents, bytes) and not filename.endswith(SAVE_EXTENSIONS):
+            saves[i] = (filename, "Invalid file type. Please upload a .sav file")
+    return saves
+
+
+@app.post("/api/batch-upload")
+async def batch_upload(files: list[UploadFile]):
+    """
+    Parse many saves at once, given as several files and/or zips of saves.
+    Streams one JSON line per save as each finishes, in completion order:
+    {"file", "party", "box"}, or {"file", "error"} if that save failed.
+    """
+    saves = await read_batch(files)
+
+    try:
+        pool.check_capacity()
+    except PoolBusy:
+        raise server_busy()
+
+    async def lines():
+        names, jobs = [], []
+        for filename, contents in saves:
+            if isinstance(contents, str):
+                yield json.dumps({"file": filename, "error": contents}) + "\n"
+            else:
+                names.append(filename)
+                jobs.append((contents,))
+
+        async for index, result, error in pool.run_batch(parse_upload, jobs):
+            if error is None:
+                line = {"file": names[index], **result}
+            else:
+                line = {"file": names[index], "error": str(error)}
+            yield json.dumps(line) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.post("/api/export")
+async def export_save(
+    save_file: UploadFile,
+    export_level: int | None = None,
+    party: bool = True,
+    box: bool = True,
+):
+    """Stream the Showdown export of an uploaded save as a text file"""
+    save = await read_save(save_file)
+    formatter = ShowdownFormatter(GameDataManager(), export_level)
+
+    return await pooled_stream(
+        stream_showdown_bytes(save, formatter, party, box),
+        media_type="text/plain; charset=utf-8",
+        headers={
+            "Content-Disposition": 'attachment; filename="pokemon_showdown_export.txt"'
+        },
+    )
+
+
+def image_response(image: bytes, media_type: str, etag: str) -> Response:
+    return Response(
+        image,
+        media_type=media_type,
+        headers={"ETag": etag, "Cache-Control": IMAGE_CACHE_CONTROL},
+    )
+
+
+@app.post("/api/team-image")
+async def team_image(
+    save_file: UploadFile,
+    export_level: int | None = None,
+    encoding: str = "png-palette",
+):
+    """Render the party as a team image in the chosen encoding"""
+    try:
+        get_encoding(encoding)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    contents = await read_upload(save_file)
+    digest = read_digest(contents)
+
+    # A repeat render is served from memory, without touching the pool
+    key = (digest, export_level, encoding)
+    cached = image_cache.get(key)
+    if cached is not None:
+        return image_response(*cached, make_etag(*key))
+
+    image, media_type, complete = await run_job(
+        render_team_image, contents, export_level, encoding
+    )
+    # Don't keep an image with missing sprites, they may load next time
+    if not complete:
+        return Response(image, media_type=media_type)
+
+    image_cache.put(key, (image, media_type))
+    return image_response(image, media_type, make_etag(*key))
+
+
+@app.get("/api/team-image/{digest}")
+async def cached_team_image(
+    digest: str,
+    export_level: int | None = None,
+    encoding: str = "png-palette",
+    if_none_match: str | None = Header(default=None),
+):
+    """Fetch a team image rendered by an earlier upload by its save digest"""
+    key = (digest, export_level, encoding)
+    cached = image_cache.get(key)
+    if cached is None:
+        raise HTTPException(
+            status_code=404, detail="No cached image for this save, upload it again"
+        )
+
+    etag = make_etag(*key)
+    if etag_matches(if_none_match, etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": IMAGE_CACHE_CONTROL},
+        )
+    return image_response(*cached, etag)
+
+
+@app.get("/api/stats")
+async def stats():
+    """Cache and worker pool counters for instrumentation"""
+    return {
+        "result_cache": result_cache.stats,
+        "image_cache": image_cache.stats,
+        "worker_pool": pool.stats,
+    }
+
+
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
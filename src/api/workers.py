@@ -0,0 +1,207 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator
+
+from save_file import SaveFile
+from pokemon_extractor import PartyPokemonExtractor, BoxPokemonExtractor
+from pokemon_parser import PartyPokemonParser, BoxPokemonParser
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+
+WORKER_KINDS = ("process", "thread")
+
+
+class PoolBusy(Exception):
+    """Every worker is busy and the queue is full."""
+
+
+def warm_worker() -> None:
+    """Load the game data once per worker, before its first job."""
+    GameDataManager().species_table
+
+
+def verify_save(contents: bytes) -> None:
+    """Check a save's size and section checksums, raising ValueError if bad."""
+    SaveFile(contents, verify_checksums=True)
+
+
+def parse_upload(contents: bytes, export_level: int | None = None) -> dict:
+    """Parse a save and format every mon for Showdown."""
+    save = SaveFile(contents, verify_checksums=True)
+
+    party_extractor = PartyPokemonExtractor(save.active_block)
+    party_parser = PartyPokemonParser()
+    party_pokemon = [
+        party_parser.parse(pokemon) for pokemon in party_extractor.pokemon_in_party
+    ]
+
+    box_extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    box_pokemon = BoxPokemonParser().parse_storage(box_extractor.storage_bytes)
+
+    formatter = ShowdownFormatter(GameDataManager(), export_level)
+
+    return {
+        "party": [formatter.format(mon) for mon in party_pokemon],
+        "box": [formatter.format(mon) for mon in box_pokemon],
+    }
+
+
+def render_team_image(
+    contents: bytes, export_level: int | None, encoding: str
+) -> tuple[bytes, str, bool]:
+    """
+    Render the party of a save as an encoded team image. Returns the image,
+    its media type and whether every sprite could be drawn.
+    """
+    save = SaveFile(contents, verify_checksums=True)
+    formatter = ShowdownFormatter(GameDataManager(), export_level, encoding)
+
+    records = PartyPokemonExtractor(save.active_block).iter_party()
+    party = list(PartyPokemonParser().iter_parse(records))
+    image = formatter.get_image_bytes(party)
+
+    complete = not formatter.missing_sprites
+    return image.getvalue(), formatter.image_encoding.media_type, complete
+
+
+class WorkerPool:
+    """
+    Runs CPU-bound jobs off the event loop on a process or thread pool.
+    At most workers + queue_size jobs are accepted at once; past that, run
+    raises PoolBusy straight away instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        kind: str = "process",
+        workers: int | None = None,
+        queue_size: int | None = None,
+    ):
+        if kind not in WORKER_KINDS:
+            raise ValueError(f"Worker kind must be one of {WORKER_KINDS}, got {kind}")
+
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_size = 2 * self.workers if queue_size is None else queue_size
+        self.pending = 0
+        self.rejected = 0
+
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+
+    @classmethod
+    def from_env(cls) -> "WorkerPool":
+        """Configure from API_WORKER_KIND, API_WORKERS and API_QUEUE_SIZE."""
+        workers = os.environ.get("API_WORKERS")
+        queue_size = os.environ.get("API_QUEUE_SIZE")
+        return cls(
+            kind=os.environ.get("API_WORKER_KIND", "process"),
+            workers=int(workers) if workers else None,
+            queue_size=int(queue_size) if queue_size else None,
+        )
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.queue_size
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=warm_worker
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, initializer=warm_worker
+                )
+        return self._executor
+
+    def check_capacity(self) -> None:
+        """Raise PoolBusy if no more jobs can be accepted right now."""
+        if self.pending >= self.capacity:
+            self.rejected += 1
+            raise PoolBusy(f"{self.pending} jobs already running or queued")
+
+    async def acquire(self, wait: bool = False) -> None:
+        """
+        Take a slot for a job. If the queue is full, raise PoolBusy, or with
+        wait, wait for a slot to free up first. Every acquire must be paired
+        with a release.
+        """
+        # Only touched from the event loop thread, so no lock is needed
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.capacity)
+
+        if not wait:
+            self.check_capacity()
+        await self._slots.acquire()
+        self.pending += 1
+
+    def release(self) -> None:
+        self.pending -= 1
+        self._slots.release()
+
+    async def run(self, fn, *args, wait: bool = False):
+        """Run fn(*args) on the pool, in a slot taken as by acquire."""
+        await self.acquire(wait)
+        loop = asyncio.get_running_loop()
+        try:
+            job = self.executor.submit(fn, *args)
+        except BaseException:
+            self.release()
+            raise
+
+        # Free the slot once the job is done, not when the caller stops
+        # waiting: a job that has started keeps running after a cancel
+        job.add_done_callback(lambda _: loop.call_soon_threadsafe(self.release))
+        return await asyncio.wrap_future(job)
+
+    async def run_batch(
+        self, fn, jobs: list[tuple]
+    ) -> AsyncIterator[tuple[int, object, Exception | None]]:
+        """
+        Run fn(*args) for every args in jobs, yielding (index, result, error)
+        as each finishes. A batch holds at most one job per worker at a time
+        and waits for free slots instead of being rejected part way through,
+        so callers should check_capacity before starting one.
+        """
+        per_batch = asyncio.Semaphore(self.workers)
+
+        async def run_one(index: int, args: tuple):
+            async with per_batch:
+                try:
+                    return index, await self.run(fn, *args, wait=True), None
+                except Exception as e:
+                    return index, None, e
+
+        tasks = [asyncio.ensure_future(run_one(i, args)) for i, args in enumerate(jobs)]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def warm_up(self) -> None:
+        """Start every worker now, so none loads game data during a request."""
+        await asyncio.gather(*(self.run(warm_worker) for _ in range(self.workers)))
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        # Bound to the event loop it was first used on
+        self._slots = None
+
+    @property
+    def stats(self) -> dict:
+        """Counters for instrumentation."""
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
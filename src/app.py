@@ -6,8 +6,9 @@ from showdown_formatter import ShowdownFormatter
 from data_manager import GameDataManager
 
 from save_file import SaveFile
-from pokemon_extractor import PartyPokemonExtractor, BoxPokemonExtractor
-from pokemon_parser import PartyPokemonParser, BoxPokemonParser
+from pokemon_extractor import PartyPokemonExtractor
+from pokemon_parser import PartyPokemonParser
+from export_pipeline import stream_showdown
 
 from markdowns import SIDEBAR, WHERE_SAVE, LINKS, FAQ
 
@@ -81,33 +82,27 @@ def main():
         try:
             with st.spinner("Processing save file..."):
                 save = SaveFile(raw)
-                export_text = ""
 
                 party_extractor = PartyPokemonExtractor(save.active_block)
                 party_parser = PartyPokemonParser()
+                party = list(party_parser.iter_parse(party_extractor.iter_party()))
 
-                box_extractor = BoxPokemonExtractor(
-                    save.active_block, save.expanded_block
+                # Team images are exact in a palette, which is the fastest encode
+                formatter = ShowdownFormatter(
+                    GameDataManager(), export_level, image_encoding="png-palette"
                 )
-                box_parser = BoxPokemonParser()
-
-                box = [box_parser.parse(p) for p in box_extractor.pokemon_in_storage]
-
-                party = [
-                    party_parser.parse(p) for p in party_extractor.pokemon_in_party
-                ]
-
-                formatter = ShowdownFormatter(GameDataManager(), export_level)
-
-                party_mons = [formatter.format(mon) for mon in party]
-                box_mons = [formatter.format(mon) for mon in box]
 
                 image_bytes = formatter.get_image_bytes(party)
 
-                if export_choice == "All" or export_choice == "Party":
-                    export_text += "\n".join(party_mons) + "\n\n"
-                if export_choice == "All" or export_choice == "Box":
-                    export_text += "\n".join(box_mons) + "\n\n"
+                # Streamed straight into one string, no per-mon lists
+                export_text = "".join(
+                    stream_showdown(
+                        save,
+                        formatter,
+                        party=export_choice in ("All", "Party"),
+                        box=export_choice in ("All", "Box"),
+                    )
+                )
 
                 with st.expander(
                     f"{export_choice} Pokémon in Showdown Format",
@@ -119,11 +114,11 @@ def main():
                         with tab1:
                             st.download_button(
                                 label="Download as Text File",
-                                data=export_text.strip(),
+                                data=export_text,
                                 file_name="pokemon_showdown_export.txt",
                                 mime="text/plain",
                             )
-                            st.code(export_text.strip(), language="")
+                            st.code(export_text, language="")
 
                         with tab2:
                             st.download_button(
@@ -141,11 +136,11 @@ def main():
                     else:
                         st.download_button(
                             label="Download as Text File",
-                            data=export_text.strip(),
+                            data=export_text,
                             file_name="pokemon_showdown_export.txt",
                             mime="text/plain",
                         )
-                        st.code(export_text.strip(), language="")
+                        st.code(export_text, language="")
 
         except Exception as e:
             st.exception(e)
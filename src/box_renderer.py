@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from cache import LRUCache
+from constants import BOX_COUNT, BOX_MON_TOTAL, MONS_PER_BOX
+from pokemon import Pokemon
+from pokemon_extractor import BoxPokemonExtractor
+from pokemon_parser import BoxPokemonParser
+from showdown_formatter import ShowdownFormatter
+from sprite_store import CANVAS_COLOR
+
+BOX_COLUMNS = 6
+BOX_ROWS = MONS_PER_BOX // BOX_COLUMNS
+SLOT_SIZE = (104, 136)
+BOX_PADDING = 10
+HEADER_HEIGHT = 24
+SHEET_COLUMNS = 5
+
+
+def parse_storage_slots(extractor: BoxPokemonExtractor) -> dict[int, Pokemon]:
+    """Parse every occupied box slot, keyed by slot index (0 is box 1 slot 1)."""
+    parser = BoxPokemonParser()
+    return {
+        slot: parser.parse(record) for slot, record in extractor.iter_storage_slots()
+    }
+
+
+class BoxImageRenderer:
+    """
+    Renders PC storage as box grids, one 6x5 image per box or one sheet for
+    the whole storage. Slot tiles are rendered on a thread pool and cached,
+    then stitched together.
+
+    Threads rather than processes: tiles come from the formatter's in-process
+    sprite and text caches, and parsed mons hold views into the save.
+    """
+
+    # Rendered slots keyed by (raw record bytes, export level), sized to hold
+    # a full storage so re-rendering an unchanged PC is only compositing
+    tile_cache = LRUCache(maxsize=BOX_MON_TOTAL)
+
+    def __init__(self, formatter: ShowdownFormatter, workers: int | None = None):
+        self.formatter = formatter
+        self.workers = workers
+
+    def slot_tile(self, p: Pokemon) -> Image.Image | None:
+        """The rendered slot of one mon, or None if its sprite can't be loaded."""
+        # Mons built by hand have no raw record to key on
+        if not p.raw_data:
+            return self._render_slot(p)
+
+        key = (bytes(p.raw_data), self.formatter.export_level)
+        tile = self.tile_cache.get(key)
+        if tile is None:
+            tile = self._render_slot(p)
+            if tile is not None:
+                self.tile_cache.put(key, tile)
+        return tile
+
+    def _render_slot(self, p: Pokemon) -> Image.Image | None:
+        prepared = self.formatter.prepared_sprite(p)
+        if prepared is None:
+            return None
+
+        sprite, name_color = prepared
+        tile = Image.new("RGBA", SLOT_SIZE, (*CANVAS_COLOR, 255))
+        tile.paste(sprite, (4, 0), sprite)
+
+        name = self.formatter.data.get_species_record(p.species_id).name
+        level = self.formatter.export_level
+        if level is None:
+            level = p.level
+
+        text_layout = self.formatter.text_layout
+        text_y = sprite.height + 2
+        text_y += text_layout.draw_line(tile, (4, text_y), name, name_color)
+        text_layout.draw_line(tile, (4, text_y), f"Lv. {level}")
+        return tile
+
+    def render_tiles(self, slots: dict[int, Pokemon]) -> dict[int, Image.Image]:
+        """Render the tile of every slot in parallel, skipping missing sprites."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            tiles = pool.map(self.slot_tile, slots.values())
+            return {
+                slot: tile
+                for slot, tile in zip(slots.keys(), tiles)
+                if tile is not None
+            }
+
+    def box_size(self) -> tuple[int, int]:
+        width = 2 * BOX_PADDING + BOX_COLUMNS * SLOT_SIZE[0]
+        height = HEADER_HEIGHT + 2 * BOX_PADDING + BOX_ROWS * SLOT_SIZE[1]
+        return width, height
+
+    def _compose_box(
+        self,
+        canvas: Image.Image,
+        origin: tuple[int, int],
+        box: int,
+        tiles: dict[int, Image.Image],
+    ) -> None:
+        x, y = origin
+        self.formatter.text_layout.draw_line(
+            canvas, (x + BOX_PADDING, y + BOX_PADDING), f"Box {box + 1}"
+        )
+
+        first_slot = box * MONS_PER_BOX
+        for position in range(MONS_PER_BOX):
+            tile = tiles.get(first_slot + position)
+            if tile is None:
+                continue
+            col = position % BOX_COLUMNS
+            row = position // BOX_COLUMNS
+            canvas.paste(
+                tile,
+                (
+                    x + BOX_PADDING + col * SLOT_SIZE[0],
+                    y + BOX_PADDING + HEADER_HEIGHT + row * SLOT_SIZE[1],
+                ),
+            )
+
+    def render_boxes(self, slots: dict[int, Pokemon]) -> list[Image.Image]:
+        """One image per box, in box order, including empty boxes."""
+        tiles = self.render_tiles(slots)
+
+        images = []
+        for box in range(BOX_COUNT):
+            image = Image.new("RGBA", self.box_size(), (*CANVAS_COLOR, 255))
+            self._compose_box(image, (0, 0), box, tiles)
+            images.append(image)
+        return images
+
+    def render_sheet(self, slots: dict[int, Pokemon]) -> Image.Image:
+        """Every box on one sheet, SHEET_COLUMNS boxes per row."""
+        tiles = self.render_tiles(slots)
+
+        box_width, box_height = self.box_size()
+        rows = -(-BOX_COUNT // SHEET_COLUMNS)
+        sheet = Image.new(
+            "RGBA",
+            (SHEET_COLUMNS * box_width, rows * box_height),
+            (*CANVAS_COLOR, 255),
+        )
+        for box in range(BOX_COUNT):
+            origin = (
+                (box % SHEET_COLUMNS) * box_width,
+                (box // SHEET_COLUMNS) * box_height,
+            )
+            self._compose_box(sheet, origin, box, tiles)
+        return sheet
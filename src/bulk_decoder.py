@@ -0,0 +1,143 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from utils import decode_gba_strings
+from constants import BOXMON_OFFSETS, BOXMON_SIZE, POKEMON_OFFSETS, POKEMON_SIZE
+
+# Reorders raw EV bytes / unpacked IVs into HP, Atk, Def, SpA, SpD, Spe
+EV_ORDER = [0, 1, 2, 4, 5, 3]
+IV_SHIFTS = [0, 5, 10, 20, 25, 15]
+
+_FIELD_FORMATS = {1: "u1", 2: "<u2", 4: "<u4"}
+
+
+def layout_dtype(offsets: dict, record_size: int) -> np.dtype:
+    """
+    Build a NumPy structured dtype from an offset table such as BOXMON_OFFSETS.
+    1, 2 and 4 byte fields become little-endian unsigned ints, anything else
+    becomes a fixed-size byte array.
+    """
+    names, formats, field_offsets = [], [], []
+    for name, (start, stop) in offsets.items():
+        width = stop - start
+        names.append(name)
+        formats.append(_FIELD_FORMATS.get(width, ("u1", (width,))))
+        field_offsets.append(start)
+
+    return np.dtype(
+        {
+            "names": names,
+            "formats": formats,
+            "offsets": field_offsets,
+            "itemsize": record_size,
+        }
+    )
+
+
+def unpack_moves_bulk(move_bytes: np.ndarray) -> np.ndarray:
+    """Unpack (n, 5) packed move bytes into (n, 4) 10-bit move IDs."""
+    packed = np.zeros(len(move_bytes), dtype=np.uint64)
+    for i in range(move_bytes.shape[1]):
+        packed |= move_bytes[:, i].astype(np.uint64) << np.uint64(8 * i)
+
+    shifts = np.arange(4, dtype=np.uint64) * np.uint64(10)
+    return ((packed[:, None] >> shifts) & np.uint64(0x3FF)).astype(np.uint16)
+
+
+def unpack_ivs_bulk(ivs_data: np.ndarray) -> np.ndarray:
+    """Unpack n packed IV words into (n, 6) IVs in HP, Atk, Def, SpA, SpD, Spe order."""
+    shifts = np.array(IV_SHIFTS, dtype=np.uint32)
+    return ((ivs_data[:, None] >> shifts) & 0x1F).astype(np.uint8)
+
+
+class RecordDecoder(ABC):
+    """Base class for decoders that view a region as fixed-size mon records."""
+
+    dtype: np.dtype
+
+    def records(self, region: bytes | memoryview) -> np.ndarray:
+        """View the region as a record array, one record per slot."""
+        size = self.dtype.itemsize
+        if len(region) % size != 0:
+            raise ValueError(f"Region length {len(region)} is not a multiple of {size}")
+        return np.frombuffer(region, dtype=self.dtype)
+
+    def raw_records(self, region: bytes | memoryview) -> np.ndarray:
+        """View the region as an (n, record size) byte array."""
+        return np.frombuffer(region, dtype=np.uint8).reshape(-1, self.dtype.itemsize)
+
+    def occupied_slots(self, records: np.ndarray) -> np.ndarray:
+        """Indices of the slots holding a mon (first personal ID byte non-zero)."""
+        return np.flatnonzero(records["personal_id"] & 0xFF)
+
+    def decode(self, region: bytes | memoryview) -> dict[str, np.ndarray]:
+        """
+        Decode all occupied slots of the region.
+        Empty slots are skipped the same way split_into_chunks skips them.
+        Returns a dict of columns, each with one row per occupied slot.
+        """
+        records = self.records(region)
+        slots = self.occupied_slots(records)
+        occupied = records[slots]
+
+        personal_id = occupied["personal_id"]
+        ivs_data = occupied["ivs_data"]
+
+        columns = {
+            "slot": slots,
+            "personal_id": personal_id,
+            "species": occupied["species"],
+            "held_item_id": occupied["held_item_id"],
+            "nickname": occupied["nickname"],
+            "moves": self.decode_moves(occupied["moves"]),
+            "evs": occupied["evs"][:, EV_ORDER],
+            "ivs": unpack_ivs_bulk(ivs_data),
+            "is_egg": ((ivs_data >> 30) & 1).astype(bool),
+            "has_ha": ((ivs_data >> 31) & 1).astype(bool),
+            "ability_index": np.where(personal_id % 2 == 0, 1, 2).astype(np.uint8),
+            "nature_index": (personal_id % 25).astype(np.uint8),
+            "raw": self.raw_records(region)[slots],
+        }
+        columns.update(self.decode_extra(occupied))
+        return columns
+
+    def nicknames(self, region: bytes | memoryview) -> list[str]:
+        """Decode the nickname of every occupied slot of the region at once."""
+        records = self.records(region)
+        return decode_gba_strings(records[self.occupied_slots(records)]["nickname"])
+
+    @abstractmethod
+    def decode_moves(self, move_bytes: np.ndarray) -> np.ndarray:
+        """Decode the layout's move field into (n, 4) move IDs."""
+        pass
+
+    def decode_extra(self, occupied: np.ndarray) -> dict[str, np.ndarray]:
+        """Decode fields only present in this record layout."""
+        return {}
+
+
+class PartyDecoder(RecordDecoder):
+    """Decodes the 100-byte party records in a few vectorized steps."""
+
+    dtype = layout_dtype(POKEMON_OFFSETS, POKEMON_SIZE)
+
+    def decode_moves(self, move_bytes: np.ndarray) -> np.ndarray:
+        """Combine (n, 8) move bytes into (n, 4) little-endian u16 move IDs."""
+        move_bytes = move_bytes.astype(np.uint16)
+        return move_bytes[:, 0::2] | (move_bytes[:, 1::2] << 8)
+
+    def decode_extra(self, occupied: np.ndarray) -> dict[str, np.ndarray]:
+        return {"level": occupied["level"]}
+
+
+class BoxStorageDecoder(RecordDecoder):
+    """Decodes every box slot of a storage region in a few vectorized steps."""
+
+    dtype = layout_dtype(BOXMON_OFFSETS, BOXMON_SIZE)
+
+    def decode_moves(self, move_bytes: np.ndarray) -> np.ndarray:
+        return unpack_moves_bulk(move_bytes)
+
+    def decode_extra(self, occupied: np.ndarray) -> dict[str, np.ndarray]:
+        return {"xp": occupied["xp"]}
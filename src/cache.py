@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Hashable
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with hit, miss and eviction counters.
+    Given sizeof, entries are also evicted to keep their total size within
+    max_bytes.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_bytes: int | None = None,
+        sizeof: Callable[[object], int] | None = None,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+        if (max_bytes is None) != (sizeof is None):
+            raise ValueError("max_bytes and sizeof must be given together")
+
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._items: OrderedDict = OrderedDict()
+        self._sizes: dict = {}
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        """Return the cached value and mark it as recently used."""
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: Hashable, default: object = None) -> object:
+        """Return the cached value without marking it used or counting it."""
+        with self._lock:
+            return self._items.get(key, default)
+
+    def put(self, key: Hashable, value: object) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        with self._lock:
+            if self.sizeof is not None:
+                size = self.sizeof(value)
+                self.bytes += size - self._sizes.get(key, 0)
+                self._sizes[key] = size
+
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize or self._over_budget():
+                evicted, _ = self._items.popitem(last=False)
+                self.bytes -= self._sizes.pop(evicted, 0)
+                self.evictions += 1
+
+    def _over_budget(self) -> bool:
+        return self.max_bytes is not None and self.bytes > self.max_bytes
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self.bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def stats(self) -> dict:
+        """Counters for instrumentation."""
+        lookups = self.hits + self.misses
+        stats = {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+        if self.sizeof is not None:
+            stats["bytes"] = self.bytes
+            stats["max_bytes"] = self.max_bytes
+        return stats
@@ -66,8 +66,30 @@ CFRU_BOX_SECTIONS = [30, 31, 2, 3, 0]  # THIS ORDER IS IMPORTANT
 # --------------------
 SECTION_ID_OFFSET = (0xFF4, 0xFF6)
 CHECKSUM_OFFSET = (0xFF6, 0xFF8)
+SIGNATURE_OFFSET = (0xFF8, 0xFFC)
 SAVE_INDEX_OFFSET = (0xFFC, 0x1000)
 
+SECTION_SIGNATURE = 0x08012025
+
+# Number of bytes covered by each section's checksum, by section ID.
+# CFRU packs sections 1-3 and the PC storage into the full 0xFF0 bytes.
+SECTION_CHECKSUM_SIZES = {
+    0: 0xF24,
+    1: 0xFF0,
+    2: 0xFF0,
+    3: 0xFF0,
+    4: 0xD98,
+    5: 0xFF0,
+    6: 0xFF0,
+    7: 0xFF0,
+    8: 0xFF0,
+    9: 0xFF0,
+    10: 0xFF0,
+    11: 0xFF0,
+    12: 0xFF0,
+    13: 0x450,
+}
+
 # --------------------
 # Section IDs
 # --------------------
@@ -119,6 +141,15 @@ BOXMON_OFFSETS = {
 }
 
 
+# Gen III growth rate order; "medium" is also called "medium-fast"
+GROWTH_RATES = ["medium", "erratic", "fluctuating", "medium-slow", "fast", "slow"]
+GROWTH_RATE_CODES = {name: code for code, name in enumerate(GROWTH_RATES)}
+GROWTH_RATE_CODES["medium-fast"] = GROWTH_RATE_CODES["medium"]
+MAX_LEVEL = 100
+
+SPRITE_URL = "https://raw.githubusercontent.com/izrofid/rrsprites/refs/heads/master/front/{species_id}.png"  # noqa: E501
+
+
 NATURES = {
     0: "Hardy",
     1: "Lonely",
@@ -0,0 +1,162 @@
+import json
+import marshal
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+BUNDLE_PATH = DATA_DIR / "game_data.bundle"
+BUNDLE_VERSION = 1
+
+# Header: u32 index length, then the marshalled index, then the sections
+_HEADER = struct.Struct("<I")
+
+
+def _intern(value: str | None) -> str | None:
+    """Share repeated strings so marshal stores them once and refers back."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _compact_growth_rates(data: list) -> list:
+    """Keep only the growth rate name per species, in file order."""
+    return [_intern(entry.get("growth_rate")) for entry in data]
+
+
+def _compact_abilities(data: dict) -> dict:
+    """Map species name to a (primary, secondary, hidden) ability tuple."""
+    return {
+        name: (
+            _intern(entry.get("primary_ability")),
+            _intern(entry.get("secondary_ability")),
+            _intern(entry.get("hidden_ability")),
+        )
+        for name, entry in data.items()
+    }
+
+
+# How each JSON file is stored in the bundle; files not listed are kept as is
+COMPACTORS = {
+    "growth_rates.json": _compact_growth_rates,
+    "abilities.json": _compact_abilities,
+}
+
+
+def load_json(filename: str) -> object:
+    """Load and compact one JSON data file."""
+    path = DATA_DIR / filename
+    try:
+        with open(path, "r") as file:
+            data = json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        print(f"Error loading data from {path.name}: {e}")
+        return {}
+    return COMPACTORS.get(filename, lambda d: d)(data)
+
+
+def build_bundle(path: Path = BUNDLE_PATH) -> bytes:
+    """Compile every data/*.json file into one marshalled bundle."""
+    sections = {
+        json_path.name: marshal.dumps(load_json(json_path.name))
+        for json_path in sorted(DATA_DIR.glob("*.json"))
+    }
+
+    index = {"__version__": BUNDLE_VERSION}
+    offset = 0
+    for name, section in sections.items():
+        index[name] = (offset, len(section))
+        offset += len(section)
+
+    packed_index = marshal.dumps(index)
+    bundle = (
+        _HEADER.pack(len(packed_index)) + packed_index + b"".join(sections.values())
+    )
+
+    # A temp file per writer, so concurrent rebuilds never replace the bundle
+    # with one another's half-written file
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp_path = Path(tmp.name)
+            tmp.write(bundle)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not write data bundle {path.name}: {e}")
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
+
+    return bundle
+
+
+def is_stale(path: Path = BUNDLE_PATH) -> bool:
+    """True if the bundle is missing or older than any JSON data file."""
+    try:
+        built = path.stat().st_mtime
+    except OSError:
+        return True
+    return any(p.stat().st_mtime > built for p in DATA_DIR.glob("*.json"))
+
+
+class DataBundle:
+    """Read-only view of the compiled data bundle, decoded one file at a time."""
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(DataBundle, cls).__new__(cls)
+            cls._instance._open(BUNDLE_PATH)
+        return cls._instance
+
+    @classmethod
+    def open(cls, path: Path) -> "DataBundle":
+        """A bundle read from path instead of the shared default one."""
+        bundle = super(DataBundle, cls).__new__(cls)
+        bundle._open(path)
+        return bundle
+
+    def _open(self, path: Path) -> None:
+        bundle = None
+        if not is_stale(path):
+            try:
+                bundle = path.read_bytes()
+                index = self._read_index(bundle)
+            except (OSError, ValueError, EOFError, struct.error):
+                bundle = None
+            else:
+                if index.get("__version__") != BUNDLE_VERSION:
+                    bundle = None
+
+        if bundle is None:
+            bundle = build_bundle(path)
+            index = self._read_index(bundle)
+
+        self._bundle = memoryview(bundle)
+        self._sections = index
+
+    def _read_index(self, bundle: bytes) -> dict:
+        (length,) = _HEADER.unpack_from(bundle)
+        self._data_start = _HEADER.size + length
+        return marshal.loads(bundle[_HEADER.size : self._data_start])
+
+    def load(self, filename: str) -> object:
+        """Decode the section for one JSON data file."""
+        if filename not in self._sections:
+            return load_json(filename)
+
+        offset, length = self._sections[filename]
+        start = self._data_start + offset
+        try:
+            return marshal.loads(self._bundle[start : start + length])
+        except (ValueError, EOFError, TypeError) as e:
+            # A truncated or corrupt bundle, the JSON is still there
+            print(f"Could not read {filename} from the data bundle: {e}")
+            return load_json(filename)
+
+
+if __name__ == "__main__":
+    bundle = build_bundle()
+    print(f"Wrote {BUNDLE_PATH} ({len(bundle):,} bytes)")
@@ -1,5 +1,12 @@
-import json
+from abc import ABC, abstractmethod
+from functools import cached_property
 from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+from constants import GROWTH_RATE_CODES
+from data_bundle import DataBundle
 
 
 class GameDataManager:
@@ -20,6 +27,20 @@ class GameDataManager:
         self.ability_data = AbilityDataProvider()
         self.item_data = ItemDataProvider()
         self.growth_rate_data = GrowthRateProvider()
+        self._species_table = None
+
+    @property
+    def species_table(self) -> "SpeciesTable":
+        """Per-species records indexed by species ID, built on first use"""
+        if self._species_table is None:
+            self._species_table = SpeciesTable(
+                self.species_data, self.ability_data, self.growth_rate_data
+            )
+        return self._species_table
+
+    def get_species_record(self, species_id: int) -> "SpeciesRecord":
+        """Get the name, abilities and growth rate of a species in one lookup"""
+        return self.species_table[species_id]
 
     def get_species_name(self, species_id: int) -> str:
         """Get a Pokémon's name by its species ID"""
@@ -41,29 +62,82 @@ class GameDataManager:
         """Get the growth rate for a Pokémon by its species ID"""
         return self.growth_rate_data.get_growth_rate(species_id)
 
+    def get_growth_rate_code(self, species_id: int) -> int:
+        """Get the growth rate code (index into GROWTH_RATES) by species ID"""
+        return self.growth_rate_data.get_growth_rate_code(species_id)
+
+    def get_growth_rate_codes(self, species_ids: np.ndarray) -> np.ndarray:
+        """Get the growth rate codes for an array of species IDs"""
+        return self.growth_rate_data.get_growth_rate_codes(species_ids)
+
     def get_item_name(self, item_id: int) -> str:
         """Get an item name by its ID"""
         return self.item_data.get_name(item_id)
 
+    def get_move_names(self, move_ids: np.ndarray) -> np.ndarray:
+        """Get the move names for an array of move IDs of any shape"""
+        return self.move_data.gather_names(move_ids)
+
+    def get_item_names(self, item_ids: np.ndarray) -> np.ndarray:
+        """Get the item names for an array of item IDs"""
+        return self.item_data.gather_names(item_ids)
+
 
 class DataProvider:
     """Base class for all data providers"""
 
+    # Type the data file holds; anything else is replaced by an empty one
+    data_type: type = list
+
     def __init__(self, filename: str) -> None:
         self.data_path = Path(__file__).parent.parent / "data" / filename
-        self._data = self._load_data()
+        self._loaded = None
+
+    @property
+    def _data(self) -> object:
+        """Data is only loaded the first time a getter needs it"""
+        if self._loaded is None:
+            loaded = self._load_data()
+            if not isinstance(loaded, self.data_type):
+                loaded = self.data_type()
+            self._loaded = loaded
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._data)
 
     def _load_data(self) -> object:
-        """Load data from JSON file"""
-        try:
-            with open(self.data_path, "r") as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
-            print(f"Error loading data from {self.data_path.name}: {e}")
-            return {}
+        """Load data from the compiled data bundle"""
+        return DataBundle().load(self.data_path.name)
+
+
+class NameDataProvider(DataProvider, ABC):
+    """Base class for providers that map an ID to a name with get_name"""
 
+    @abstractmethod
+    def get_name(self, data_id: int) -> str | None:
+        """Look up the name for an ID, None if it is unknown"""
+        pass
 
-class SpeciesDataProvider(DataProvider):
+    @cached_property
+    def names_by_id(self) -> np.ndarray:
+        """get_name for every ID from 0 to the last one, as an object array"""
+        return np.array(
+            [self.get_name(data_id) for data_id in range(len(self) + 1)], dtype=object
+        )
+
+    def gather_names(self, data_ids: np.ndarray) -> np.ndarray:
+        """get_name for an array of IDs of any shape, using one fancy-index"""
+        data_ids = np.asarray(data_ids, dtype=np.int64)
+        known = (data_ids >= 0) & (data_ids < len(self.names_by_id))
+
+        names = self.names_by_id[np.where(known, data_ids, 0)]
+        for index in zip(*np.nonzero(~known)):
+            names[index] = self.get_name(int(data_ids[index]))
+        return names
+
+
+class SpeciesDataProvider(NameDataProvider):
     """Provider for Pokémon species data"""
 
     def __init__(self) -> None:
@@ -71,12 +145,12 @@ class SpeciesDataProvider(DataProvider):
 
     def get_name(self, species_id: int) -> str:
         """Get a Pokémon's name by its species ID"""
-        if isinstance(self._data, list) and 1 <= species_id <= len(self._data):
+        if 1 <= species_id <= len(self._data):
             return self._data[species_id - 1]
         return f"Unknown ({species_id})"
 
 
-class MoveDataProvider(DataProvider):
+class MoveDataProvider(NameDataProvider):
     """Provider for Pokémon move data"""
 
     def __init__(self) -> None:
@@ -84,7 +158,7 @@ class MoveDataProvider(DataProvider):
 
     def get_name(self, move_id: int) -> str | None:
         """Get a move name by its ID"""
-        if isinstance(self._data, list) and 1 <= move_id <= len(self._data):
+        if 1 <= move_id <= len(self._data):
             return self._data[move_id - 1]
         elif move_id == 0:
             return None
@@ -95,9 +169,15 @@ class MoveDataProvider(DataProvider):
 class AbilityDataProvider(DataProvider):
     """Provider for Pokémon ability data"""
 
+    data_type = dict
+
     def __init__(self) -> None:
         super().__init__("abilities.json")
 
+    def get_abilities(self, pokemon_name: str) -> tuple | None:
+        """Get the (primary, secondary, hidden) abilities of a Pokemon by name"""
+        return self._data.get(pokemon_name)
+
     def get_ability_name(
         self, ability_id: int, pokemon_name: str, has_hidden_ability: bool
     ) -> str:
@@ -108,16 +188,16 @@ class AbilityDataProvider(DataProvider):
         if pokemon_name not in self._data:
             return f"Unknown Ability (for {pokemon_name})"
 
-        ha = self._data[pokemon_name].get("hidden_ability")
+        primary, secondary, ha = self._data[pokemon_name]
 
         if has_hidden_ability and ha is not None:
-            return self._data[pokemon_name].get("hidden_ability")
+            return ha
 
         elif ability_id == 1:
-            return self._data[pokemon_name].get("primary_ability")
+            return primary
 
         elif ability_id == 2:
-            return self._data[pokemon_name].get("secondary_ability")
+            return secondary
         else:
             return f"Found Nothing (for {pokemon_name} ability_id: {ability_id} ha: {has_hidden_ability})"
 
@@ -127,17 +207,43 @@ class GrowthRateProvider(DataProvider):
 
     def __init__(self) -> None:
         super().__init__("growth_rates.json")
+        self._default_code = GROWTH_RATE_CODES["medium"]
+
+    @cached_property
+    def _codes(self) -> np.ndarray:
+        """codes[species_id] holds the growth rate code get_growth_rate maps to"""
+        return np.array(
+            [
+                GROWTH_RATE_CODES[self.get_growth_rate(species_id)]
+                for species_id in range(len(self._data))
+            ],
+            dtype=np.uint8,
+        )
 
     def get_growth_rate(self, species_id: int) -> str:
         """Get the growth rate for a Pokémon by its species ID"""
-        if isinstance(self._data, list) and 0 <= species_id < len(self._data):
-            growth_rate = self._data[species_id - 1].get("growth_rate")
+        if 0 <= species_id < len(self._data):
+            growth_rate = self._data[species_id - 1]
             if growth_rate:
                 return growth_rate
         return "medium"  # Default to medium if not found
 
+    def get_growth_rate_code(self, species_id: int) -> int:
+        """Get the growth rate code (index into GROWTH_RATES) by species ID"""
+        if 0 <= species_id < len(self._codes):
+            return int(self._codes[species_id])
+        return self._default_code
+
+    def get_growth_rate_codes(self, species_ids: np.ndarray) -> np.ndarray:
+        """Get the growth rate codes for an array of species IDs"""
+        species_ids = np.asarray(species_ids, dtype=np.int64)
+        known = (species_ids >= 0) & (species_ids < len(self._codes))
+        codes = np.full(len(species_ids), self._default_code, dtype=np.uint8)
+        codes[known] = self._codes[species_ids[known]]
+        return codes
 
-class ItemDataProvider(DataProvider):
+
+class ItemDataProvider(NameDataProvider):
     """Provider for Pokémon item data"""
 
     def __init__(self) -> None:
@@ -147,6 +253,133 @@ class ItemDataProvider(DataProvider):
         """Get an item name by its ID"""
         if item_id == 0:
             return "None"
-        if isinstance(self._data, list) and 1 <= item_id <= len(self._data):
+        if 1 <= item_id <= len(self._data):
             return self._data[item_id - 1]
         return f"Unknown Item ({item_id})"
+
+
+class SpeciesRecord(NamedTuple):
+    """Everything needed to format a species, resolved ahead of time"""
+
+    species_id: int
+    name: str
+    primary_ability: str | None
+    secondary_ability: str | None
+    hidden_ability: str | None
+    has_ability_data: bool
+    growth_rate_code: int
+    sprite_key: str
+
+    def ability_name(self, ability_id: int, has_hidden_ability: bool) -> str:
+        """Same result as AbilityDataProvider.get_ability_name for this species"""
+        if not self.has_ability_data:
+            return f"Unknown Ability (for {self.name})"
+
+        if has_hidden_ability and self.hidden_ability is not None:
+            return self.hidden_ability
+
+        elif ability_id == 1:
+            return self.primary_ability
+
+        elif ability_id == 2:
+            return self.secondary_ability
+        else:
+            return f"Found Nothing (for {self.name} ability_id: {ability_id} ha: {has_hidden_ability})"
+
+
+class SpeciesTable:
+    """Per-species records indexed by species ID, plus the same data as arrays"""
+
+    def __init__(
+        self,
+        species_data: SpeciesDataProvider,
+        ability_data: AbilityDataProvider,
+        growth_rate_data: GrowthRateProvider,
+    ) -> None:
+        self._species_data = species_data
+        self._ability_data = ability_data
+        self._growth_rate_data = growth_rate_data
+
+        # Index 0 and anything past the last species resolve to "Unknown (id)"
+        count = len(species_data) + 1
+        self.records = [self._build_record(species_id) for species_id in range(count)]
+
+        self.names = np.array([r.name for r in self.records], dtype=object)
+        self.growth_rate_codes = np.array(
+            [r.growth_rate_code for r in self.records], dtype=np.uint8
+        )
+        self.sprite_keys = np.array([r.sprite_key for r in self.records], dtype=object)
+
+    def _build_record(self, species_id: int) -> SpeciesRecord:
+        name = self._species_data.get_name(species_id)
+        abilities = self._ability_data.get_abilities(name)
+        primary, secondary, hidden = abilities or (None, None, None)
+
+        return SpeciesRecord(
+            species_id=species_id,
+            name=name,
+            primary_ability=primary,
+            secondary_ability=secondary,
+            hidden_ability=hidden,
+            has_ability_data=abilities is not None,
+            growth_rate_code=self._growth_rate_data.get_growth_rate_code(species_id),
+            sprite_key=str(species_id),
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, species_id: int) -> SpeciesRecord:
+        if 0 <= species_id < len(self.records):
+            return self.records[species_id]
+        return self._build_record(species_id)
+
+    def gather_names(self, species_ids: np.ndarray) -> np.ndarray:
+        """Species names for a whole array of species IDs with one fancy-index"""
+        return self._species_data.gather_names(species_ids)
+
+    @cached_property
+    def ability_choices(self) -> np.ndarray:
+        """
+        (species, 4) array of ability names, column 2 * has_hidden_ability +
+        ability_id - 1, so a whole box resolves with one fancy-index
+        """
+        return np.array(
+            [
+                [
+                    record.ability_name(ability_id, has_ha)
+                    for has_ha in (False, True)
+                    for ability_id in (1, 2)
+                ]
+                for record in self.records
+            ],
+            dtype=object,
+        )
+
+    def gather_ability_names(
+        self,
+        species_ids: np.ndarray,
+        ability_ids: np.ndarray,
+        has_hidden_ability: np.ndarray,
+    ) -> np.ndarray:
+        """SpeciesRecord.ability_name for whole arrays of mons at once"""
+        species_ids = np.asarray(species_ids, dtype=np.int64)
+        ability_ids = np.asarray(ability_ids, dtype=np.int64)
+        has_hidden_ability = np.asarray(has_hidden_ability, dtype=bool)
+
+        known = (
+            (species_ids >= 0)
+            & (species_ids < len(self.records))
+            & ((ability_ids == 1) | (ability_ids == 2))
+        )
+        columns = 2 * has_hidden_ability + ability_ids - 1
+
+        names = self.ability_choices[
+            np.where(known, species_ids, 0), np.where(known, columns, 0)
+        ]
+        for i in np.flatnonzero(~known).tolist():
+            record = self[int(species_ids[i])]
+            names[i] = record.ability_name(
+                int(ability_ids[i]), bool(has_hidden_ability[i])
+            )
+        return names
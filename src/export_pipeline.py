@@ -0,0 +1,132 @@
+import json
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator
+
+from constants import MONS_PER_BOX
+from save_file import SaveFile
+from bulk_decoder import BoxStorageDecoder
+from pokemon_extractor import PartyPokemonExtractor, BoxPokemonExtractor
+from pokemon_parser import PartyPokemonParser, BoxPokemonParser
+from showdown_formatter import ShowdownFormatter
+
+
+def _join_sections(sections: Iterable[Iterator[str]]) -> Iterator[str]:
+    """
+    Yield the blocks of each section with the separators between them:
+    one newline between blocks, a blank line between non-empty sections.
+    """
+    first = True
+    for blocks in sections:
+        section_first = True
+        for block in blocks:
+            if not section_first:
+                yield "\n"
+            elif not first:
+                yield "\n\n"
+            yield block
+            first = section_first = False
+
+
+def stream_showdown(
+    save: SaveFile,
+    formatter: ShowdownFormatter,
+    party: bool = True,
+    box: bool = True,
+) -> Iterator[str]:
+    """
+    Stream the Showdown export of a save, one text piece at a time.
+    Records are extracted, parsed and formatted lazily, so the first piece is
+    ready before the storage is decoded and memory stays flat as boxes fill.
+    "".join() of the pieces gives the same text the full export builds.
+    """
+    sections = []
+    if party:
+        records = PartyPokemonExtractor(save.active_block).iter_party()
+        mons = PartyPokemonParser().iter_parse(records)
+        sections.append(formatter.iter_format(mons))
+    if box:
+        extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+        mons = BoxPokemonParser().iter_parse(extractor.iter_storage())
+        sections.append(formatter.iter_format(mons))
+
+    # Hold one piece back so the export can be stripped like the full text
+    held = None
+    for piece in _join_sections(sections):
+        if held is None:
+            held = piece.lstrip()
+            continue
+        yield held
+        held = piece
+
+    if held is not None:
+        yield held.rstrip()
+
+
+def stream_showdown_bytes(
+    save: SaveFile,
+    formatter: ShowdownFormatter,
+    party: bool = True,
+    box: bool = True,
+) -> Iterator[bytes]:
+    """stream_showdown encoded as UTF-8, for file handles and HTTP responses."""
+    for piece in stream_showdown(save, formatter, party, box):
+        yield piece.encode("utf-8")
+
+
+def _party_records(save: SaveFile, formatter: ShowdownFormatter) -> Iterator[dict]:
+    parser = PartyPokemonParser()
+    records = PartyPokemonExtractor(save.active_block).iter_party()
+    for slot, record in enumerate(records, 1):
+        yield {
+            "source": "party",
+            "slot": slot,
+            "showdown": formatter.format(parser.parse(record)),
+        }
+
+
+def _box_records(save: SaveFile, formatter: ShowdownFormatter) -> Iterator[dict]:
+    extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    storage = extractor.storage_bytes
+    decoder = BoxStorageDecoder()
+    slots = decoder.occupied_slots(decoder.records(storage)).tolist()
+    blocks = formatter.format_table(BoxPokemonParser().parse_table(storage))
+    for index, showdown in zip(slots, blocks):
+        box, slot = divmod(index, MONS_PER_BOX)
+        yield {
+            "source": "box",
+            "box": box + 1,
+            "slot": slot + 1,
+            "showdown": showdown,
+        }
+
+
+def stream_records(save: SaveFile, formatter: ShowdownFormatter) -> Iterator[dict]:
+    """
+    Yield one record per mon, party first:
+    {"source": "party", "slot", "showdown"} or
+    {"source": "box", "box", "slot", "showdown"}, numbered from 1.
+    The party is formatted mon by mon so it goes out straight away; the
+    storage is decoded and formatted in bulk, which is far cheaper per mon.
+    """
+    yield from _party_records(save, formatter)
+    yield from _box_records(save, formatter)
+
+
+def stream_ndjson(save: SaveFile, formatter: ShowdownFormatter) -> Iterator[bytes]:
+    """
+    stream_records as newline-delimited JSON, one UTF-8 line per mon. Lines
+    are sent a party or a box at a time rather than one small write per mon,
+    and the party before the storage is decoded.
+    """
+
+    def chunk(records: Iterable[dict]) -> bytes:
+        lines = (json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        return "".join(lines).encode("utf-8")
+
+    party = list(_party_records(save, formatter))
+    if party:
+        yield chunk(party)
+
+    for _, records in groupby(_box_records(save, formatter), itemgetter("box")):
+        yield chunk(records)
@@ -0,0 +1,88 @@
+from io import BytesIO
+from typing import NamedTuple
+
+from PIL import Image
+
+
+class ImageEncoding(NamedTuple):
+    """
+    How a rendered image is saved. compress_level is zlib's 0-9 for PNG,
+    palette stores up to 256 colours in P mode. For lossless WebP, method
+    (0-6) and quality (0-100) both trade encode time for size.
+    """
+
+    format: str = "PNG"
+    compress_level: int = 6
+    palette: bool = False
+    lossless: bool = True
+    method: int = 4
+    quality: int = 80
+
+    @property
+    def media_type(self) -> str:
+        return f"image/{self.format.lower()}"
+
+    @property
+    def extension(self) -> str:
+        return self.format.lower()
+
+    def encode(self, img: Image.Image) -> BytesIO:
+        """Save img to a rewound in-memory buffer."""
+        if self.palette:
+            img = to_palette(img)
+
+        buf = BytesIO()
+        if self.format == "PNG":
+            img.save(buf, format="PNG", compress_level=self.compress_level)
+        elif self.format == "WEBP":
+            img.save(
+                buf,
+                format="WEBP",
+                lossless=self.lossless,
+                method=self.method,
+                quality=self.quality,
+            )
+        else:
+            img.save(buf, format=self.format)
+        buf.seek(0)
+        return buf
+
+
+def to_palette(img: Image.Image) -> Image.Image:
+    """
+    Convert to P mode. Exact when the image has at most 256 colours, as team
+    images mostly do; otherwise the colours are reduced without dithering.
+    """
+    # Rendered images are opaque, so the alpha channel can be dropped
+    if img.mode == "RGBA" and img.getextrema()[3][0] == 255:
+        img = img.convert("RGB")
+
+    colors = img.getcolors(256)
+    if colors is None or img.mode != "RGB":
+        return img.quantize(
+            colors=256, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE
+        )
+
+    palette = Image.new("P", (1, 1))
+    palette.putpalette([channel for _, color in colors for channel in color])
+    return img.quantize(palette=palette, dither=Image.Dither.NONE)
+
+
+ENCODINGS = {
+    "png": ImageEncoding(),
+    "png-fast": ImageEncoding(compress_level=1),
+    "png-palette": ImageEncoding(compress_level=3, palette=True),
+    "webp": ImageEncoding(format="WEBP", method=1, quality=20),
+}
+
+
+def get_encoding(encoding: str | ImageEncoding) -> ImageEncoding:
+    """Resolve an encoding name from ENCODINGS, or pass an ImageEncoding through."""
+    if isinstance(encoding, ImageEncoding):
+        return encoding
+    try:
+        return ENCODINGS[encoding]
+    except KeyError:
+        raise ValueError(
+            f"Unknown image encoding {encoding!r}, expected one of {list(ENCODINGS)}"
+        ) from None
@@ -1,4 +1,10 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from typing import Iterator
+
+import numpy as np
+
+from constants import NATURES, SPRITE_URL
+from utils import decode_gba_string, decode_gba_strings
 
 
 @dataclass
@@ -46,4 +52,124 @@ class Pokemon:
     move_ids: list[int]
     nature: str
     sprite_url: str
-    raw_data: bytes = b""
+    raw_data: bytes | memoryview = b""
+
+
+@dataclass
+class PokemonTable:
+    """
+    Holds many Pokémon as one NumPy column per field (struct of arrays).
+    Row i of every column belongs to the same Pokémon.
+    """
+
+    species_id: np.ndarray  # (n,) uint16
+    level: np.ndarray  # (n,) uint8
+    held_item_id: np.ndarray  # (n,) uint16
+    move_ids: np.ndarray  # (n, 4) uint16
+    evs: np.ndarray  # (n, 6) uint8, HP/Atk/Def/SpA/SpD/Spe
+    ivs: np.ndarray  # (n, 6) uint8, HP/Atk/Def/SpA/SpD/Spe
+    is_egg_flag: np.ndarray  # (n,) bool
+    has_ha_flag: np.ndarray  # (n,) bool
+    nature_index: np.ndarray  # (n,) uint8, key into NATURES
+    ability_index: np.ndarray  # (n,) uint8, 1 = primary, 2 = secondary
+    nickname_bytes: np.ndarray  # (n, 10) uint8, GBA encoded
+    raw_data: np.ndarray  # (n, record size) uint8
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, np.ndarray], level: np.ndarray):
+        """Create a table from the columns returned by a RecordDecoder."""
+        return cls(
+            species_id=columns["species"],
+            level=np.asarray(level, dtype=np.uint8),
+            held_item_id=columns["held_item_id"],
+            move_ids=columns["moves"],
+            evs=columns["evs"],
+            ivs=columns["ivs"],
+            is_egg_flag=columns["is_egg"],
+            has_ha_flag=columns["has_ha"],
+            nature_index=columns["nature_index"],
+            ability_index=columns["ability_index"],
+            nickname_bytes=columns["nickname"],
+            raw_data=columns["raw"],
+        )
+
+    @property
+    def nicknames(self) -> list[str]:
+        """Decode every nickname in the table at once."""
+        return decode_gba_strings(self.nickname_bytes)
+
+    def __len__(self) -> int:
+        return len(self.species_id)
+
+    def __getitem__(self, index: int) -> Pokemon:
+        """Materialize row index as a Pokemon."""
+        return self._make_row(
+            self.species_id[index].item(),
+            self.level[index].item(),
+            self.held_item_id[index].item(),
+            self.move_ids[index].tolist(),
+            self.evs[index].tolist(),
+            self.ivs[index].tolist(),
+            self.is_egg_flag[index].item(),
+            self.has_ha_flag[index].item(),
+            self.nature_index[index].item(),
+            self.ability_index[index].item(),
+            decode_gba_string(self.nickname_bytes[index]),
+            self.raw_data[index],
+        )
+
+    def __iter__(self) -> Iterator[Pokemon]:
+        """Yield every row as a Pokemon, converting each column only once."""
+        rows = zip(
+            self.species_id.tolist(),
+            self.level.tolist(),
+            self.held_item_id.tolist(),
+            self.move_ids.tolist(),
+            self.evs.tolist(),
+            self.ivs.tolist(),
+            self.is_egg_flag.tolist(),
+            self.has_ha_flag.tolist(),
+            self.nature_index.tolist(),
+            self.ability_index.tolist(),
+            self.nicknames,
+            self.raw_data,
+        )
+        for row in rows:
+            yield self._make_row(*row)
+
+    @staticmethod
+    def _make_row(
+        species_id,
+        level,
+        held_item_id,
+        move_ids,
+        evs,
+        ivs,
+        is_egg_flag,
+        has_ha_flag,
+        nature_index,
+        ability_index,
+        nickname,
+        raw_data,
+    ) -> Pokemon:
+        return Pokemon(
+            species_id=species_id,
+            level=level,
+            held_item_id=held_item_id,
+            nickname=nickname,
+            evs=StatBlock.from_list(evs),
+            ivs=StatBlock.from_list(ivs),
+            is_egg_flag=is_egg_flag,
+            has_ha_flag=has_ha_flag,
+            ability_index=ability_index,
+            move_ids=move_ids,
+            nature=NATURES[nature_index],
+            sprite_url=SPRITE_URL.format(species_id=species_id),
+            raw_data=raw_data.tobytes(),
+        )
+
+    def take(self, indices: np.ndarray) -> "PokemonTable":
+        """Return a new table holding only the given rows (indices or bool mask)."""
+        return PokemonTable(
+            **{f.name: getattr(self, f.name)[indices] for f in fields(self)}
+        )
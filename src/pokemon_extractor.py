@@ -1,5 +1,6 @@
 from save_block import SaveBlock
-from utils import get_slice, split_into_chunks
+from typing import Iterator
+from utils import get_slice, iter_chunks, split_into_chunks
 from loggers import logger
 
 from constants import (
@@ -17,18 +18,25 @@ class PartyPokemonExtractor:
         self.active_block = active_block
 
     @property
-    def pokemon_in_party(self) -> list[bytes]:
-        """Extract party Pokémon data from the active block."""
-        party_pokemon = []
-
+    def party_bytes(self) -> memoryview:
+        """Return the party region of the active block."""
         party_section = self.active_block.get_section(1)
 
-        party_data = get_slice(party_section.data, PARTY_OFFSET)
+        return get_slice(party_section.data, PARTY_OFFSET)
+
+    @property
+    def pokemon_in_party(self) -> list[memoryview]:
+        """Extract party Pokémon data from the active block."""
+        party_data = self.party_bytes
 
         party_pokemon = split_into_chunks(party_data, POKEMON_SIZE, skip_empty=True)
 
         return party_pokemon
 
+    def iter_party(self) -> Iterator[memoryview]:
+        """Yield the party Pokémon records one at a time."""
+        return iter_chunks(self.party_bytes, POKEMON_SIZE, skip_empty=True)
+
 
 class BoxPokemonExtractor:
     def __init__(self, active_block: SaveBlock, expanded_block: SaveBlock):
@@ -36,18 +44,14 @@ class BoxPokemonExtractor:
         self.active_block = active_block
         self.expanded_block = expanded_block
 
-    @property
-    def pokemon_in_storage(self) -> list[bytes]:
-        """Extract box Pokémon data from the active block."""
-        box_pokemon = []
-
+    def box_regions(self) -> Iterator[memoryview]:
+        """Yield the box region of each storage section, in storage order."""
         # Extract vanilla boxes
-        res = []
         for sid in FRLG_BOX_SECTIONS:
             section = self.active_block.get_section(sid)
             box_bytes = get_slice(section.data, BOX_OFFSETS[sid])
-            res.append(box_bytes)
             logger.debug(f"box bytes has length of {len(box_bytes)}")
+            yield box_bytes
 
         # Extract CFRU boxes
         for sid in CFRU_BOX_SECTIONS:
@@ -55,12 +59,58 @@ class BoxPokemonExtractor:
                 section = self.active_block.get_section(sid)
             else:
                 section = self.expanded_block.get_section(sid)
-            box_bytes = get_slice(section.data, BOX_OFFSETS[sid])
-            res.append(box_bytes)
+            yield get_slice(section.data, BOX_OFFSETS[sid])
 
-        # Combine all boxes into raw bytes
-        box_data = b"".join(res)
+    @property
+    def storage_bytes(self) -> bytes:
+        """Return every box region of the storage joined into one buffer."""
+        # Combine all boxes into raw bytes. Mons straddle section boundaries,
+        # so this is the one copy made; chunks taken from it are views.
+        return b"".join(self.box_regions())
+
+    @property
+    def pokemon_in_storage(self) -> list[memoryview]:
+        """Extract box Pokémon data from the active block."""
+        box_data = self.storage_bytes
 
         box_pokemon = split_into_chunks(box_data, BOXMON_SIZE, skip_empty=True)
 
         return box_pokemon
+
+    def iter_storage_slots(self) -> Iterator[tuple[int, bytes | memoryview]]:
+        """
+        Yield (slot index, record) for each occupied box slot, one section at
+        a time, without joining the whole storage. Slot 0 is the first slot
+        of box 1. Only records straddling two sections are copied.
+        """
+        slot = 0
+        carry = b""
+        for region in self.box_regions():
+            view = memoryview(region)
+            if carry:
+                needed = BOXMON_SIZE - len(carry)
+                carry += bytes(view[:needed])
+                view = view[needed:]
+                if len(carry) < BOXMON_SIZE:
+                    continue
+                if carry[0] != 0:
+                    yield slot, carry
+                slot += 1
+                carry = b""
+
+            whole = len(view) - len(view) % BOXMON_SIZE
+            for record in iter_chunks(view[:whole], BOXMON_SIZE, skip_empty=False):
+                if record[0] != 0:
+                    yield slot, record
+                slot += 1
+            carry = bytes(view[whole:])
+
+        if carry:
+            raise ValueError(
+                f"Storage ends with a partial record of {len(carry)} bytes"
+            )
+
+    def iter_storage(self) -> Iterator[bytes | memoryview]:
+        """Yield the box Pokémon records one section at a time."""
+        for _, record in self.iter_storage_slots():
+            yield record
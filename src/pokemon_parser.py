@@ -1,67 +1,61 @@
 from abc import ABC, abstractmethod
-from pokemon import Pokemon, StatBlock
+from typing import Iterable, Iterator
+from pokemon import Pokemon, PokemonTable, StatBlock
 from data_manager import GameDataManager
 
 from utils import (
-    int_from_slice,
-    get_slice,
     decode_gba_string,
-    unpack_ivs,
-    is_egg,
-    has_ha,
     get_ability_index,
-    extract_moves,
-    unpack_moves,
     calculate_nature,
-    xp_to_lvl,
+    level_from_xp,
+    levels_from_xp,
 )
 
-from constants import POKEMON_SIZE, POKEMON_OFFSETS, BOXMON_OFFSETS, BOXMON_SIZE
+from bulk_decoder import BoxStorageDecoder, PartyDecoder
+from record_layout import PARTY_LAYOUT, BOX_LAYOUT
+from constants import POKEMON_SIZE, BOXMON_SIZE, SPRITE_URL
 
 
 class PokemonParser(ABC):
     @abstractmethod
-    def parse(self, raw: bytes) -> Pokemon:
+    def parse(self, raw: bytes | memoryview) -> Pokemon:
         """Parse a single Pokémon's raw bytes."""
         pass
 
+    def iter_parse(self, records: Iterable[bytes | memoryview]) -> Iterator[Pokemon]:
+        """Parse records lazily, one Pokémon per record."""
+        for raw in records:
+            yield self.parse(raw)
+
 
 class PartyPokemonParser(PokemonParser):
     def __init__(self):
         super().__init__()
 
-    def parse(self, raw: bytes) -> Pokemon:
+    def parse(self, raw: bytes | memoryview) -> Pokemon:
         """Parse a single Pokémon's raw bytes from the party."""
 
         if len(raw) != POKEMON_SIZE:
             raise ValueError(f"Invalid Pokémon data size: {len(raw)} bytes")
 
-        # Values that need extra processing
-        personal_id = int_from_slice(raw, POKEMON_OFFSETS["personal_id"])
-        nickname_bytes = get_slice(raw, POKEMON_OFFSETS["nickname"])
-
-        ivs_data = int_from_slice(raw, POKEMON_OFFSETS["ivs_data"])
-        iv_list = unpack_ivs(ivs_data)
-
-        ev_bytes = get_slice(raw, POKEMON_OFFSETS["evs"])
-        ev_list = [ev_bytes[i] for i in (0, 1, 2, 4, 5, 3)]
-
-        move_bytes = get_slice(raw, POKEMON_OFFSETS["moves"])
+        # Every field in one unpack_from, bitfields already split
+        fields = PARTY_LAYOUT.unpack(raw)
+        personal_id = fields["personal_id"]
+        species_id = fields["species"]
 
         # Actual values
-        species_id = int_from_slice(raw, POKEMON_OFFSETS["species"])
-        level = int_from_slice(raw, POKEMON_OFFSETS["level"])
-        held_item_id = int_from_slice(raw, POKEMON_OFFSETS["held_item_id"])
-        nickname = decode_gba_string(nickname_bytes)
-        evs = StatBlock.from_list(ev_list)
-        ivs = StatBlock.from_list(iv_list)
-        is_egg_flag = is_egg(ivs_data)
-        is_ha_flag = has_ha(ivs_data)
+        level = fields["level"]
+        held_item_id = fields["held_item_id"]
+        nickname = decode_gba_string(fields["nickname"])
+        evs = StatBlock.from_list(fields["ev_list"])
+        ivs = StatBlock.from_list(fields["iv_list"])
+        is_egg_flag = fields["is_egg"]
+        is_ha_flag = fields["has_ha"]
         ability_index = get_ability_index(personal_id)
-        move_ids = extract_moves(move_bytes)
+        move_ids = fields["move_ids"]
         nature = calculate_nature(personal_id)
         raw_data = raw
-        sprite_url = f"https://raw.githubusercontent.com/izrofid/rrsprites/refs/heads/master/front/{species_id}.png"
+        sprite_url = SPRITE_URL.format(species_id=species_id)
 
         return Pokemon(
             species_id=species_id,
@@ -79,12 +73,17 @@ class PartyPokemonParser(PokemonParser):
             sprite_url=sprite_url,
         )
 
+    def parse_table(self, party: bytes | memoryview) -> PokemonTable:
+        """Parse every occupied slot of the party region into a table."""
+        columns = PartyDecoder().decode(party)
+        return PokemonTable.from_columns(columns, columns["level"])
+
 
 class BoxPokemonParser(PokemonParser):
     def __init__(self):
         super().__init__()
 
-    def parse(self, raw: bytes) -> Pokemon:
+    def parse(self, raw: bytes | memoryview) -> Pokemon:
         """Parse a single Pokémon's raw bytes from the box."""
         if len(raw) != BOXMON_SIZE:
             raise ValueError(f"Invalid Pokémon data size: {len(raw)} bytes")
@@ -92,37 +91,25 @@ class BoxPokemonParser(PokemonParser):
         # Data manager for growth rates
         gdm = GameDataManager()
 
-        # Values that need extra processing
-        personal_id = int_from_slice(raw, BOXMON_OFFSETS["personal_id"])
-        species_id = int_from_slice(raw, BOXMON_OFFSETS["species"])
-
-        xp = int_from_slice(raw, BOXMON_OFFSETS["xp"])
-        growth_rate = gdm.get_growth_rate(species_id)
-
-        nickname_bytes = get_slice(raw, BOXMON_OFFSETS["nickname"])
-
-        ev_bytes = get_slice(raw, BOXMON_OFFSETS["evs"])
-        ev_list = [ev_bytes[i] for i in (0, 1, 2, 4, 5, 3)]
-
-        ivs_data = int_from_slice(raw, BOXMON_OFFSETS["ivs_data"])
-        iv_list = unpack_ivs(ivs_data)
-
-        move_bytes = get_slice(raw, BOXMON_OFFSETS["moves"])
+        # Every field in one unpack_from, bitfields already split
+        fields = BOX_LAYOUT.unpack(raw)
+        personal_id = fields["personal_id"]
+        species_id = fields["species"]
+        growth_rate_code = gdm.get_growth_rate_code(species_id)
 
         # Actual values
-        # species_id = int_from_slice(raw, BOXMON_OFFSETS["species"])
-        level = xp_to_lvl(xp, growth_rate)
-        held_item_id = int_from_slice(raw, BOXMON_OFFSETS["held_item_id"])
-        nickname = decode_gba_string(nickname_bytes)
-        evs = StatBlock.from_list(ev_list)
-        ivs = StatBlock.from_list(iv_list)
-        is_egg_flag = is_egg(ivs_data)
-        is_ha_flag = has_ha(ivs_data)
+        level = level_from_xp(fields["xp"], growth_rate_code)
+        held_item_id = fields["held_item_id"]
+        nickname = decode_gba_string(fields["nickname"])
+        evs = StatBlock.from_list(fields["ev_list"])
+        ivs = StatBlock.from_list(fields["iv_list"])
+        is_egg_flag = fields["is_egg"]
+        is_ha_flag = fields["has_ha"]
         ability_index = get_ability_index(personal_id)
-        move_ids = unpack_moves(move_bytes)
+        move_ids = fields["move_ids"]
         nature = calculate_nature(personal_id)
         raw_data = raw
-        sprite_url = f"https://raw.githubusercontent.com/izrofid/rrsprites/refs/heads/master/front/{species_id}.png"
+        sprite_url = SPRITE_URL.format(species_id=species_id)
 
         return Pokemon(
             species_id=species_id,
@@ -139,3 +126,20 @@ class BoxPokemonParser(PokemonParser):
             raw_data=raw_data,
             sprite_url=sprite_url,
         )
+
+    def parse_table(self, storage: bytes | memoryview) -> PokemonTable:
+        """Parse every occupied slot of a whole storage region into a table."""
+        gdm = GameDataManager()
+        columns = BoxStorageDecoder().decode(storage)
+
+        growth_rate_codes = gdm.get_growth_rate_codes(columns["species"])
+        level = levels_from_xp(columns["xp"], growth_rate_codes)
+
+        return PokemonTable.from_columns(columns, level)
+
+    def parse_storage(self, storage: bytes | memoryview) -> list[Pokemon]:
+        """
+        Parse every occupied slot of a whole storage region at once.
+        Gives the same result as calling parse on each pokemon_in_storage chunk.
+        """
+        return list(self.parse_table(storage))
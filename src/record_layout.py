@@ -0,0 +1,111 @@
+import struct
+from typing import Callable
+
+from constants import POKEMON_OFFSETS, POKEMON_SIZE, BOXMON_OFFSETS, BOXMON_SIZE
+from utils import unpack_ivs, unpack_moves, is_egg, has_ha
+
+# struct codes for fields that are a single little-endian unsigned int
+_SCALAR_CODES = {1: "B", 2: "H", 4: "I"}
+
+
+class RecordLayout:
+    """
+    Compiles an offset table such as POKEMON_OFFSETS into one precompiled
+    struct.Struct, so a whole record decodes with a single unpack_from.
+
+    1, 2 and 4 byte fields decode as ints. Other fields decode as a tuple of
+    byte values unless formats gives a struct code for them (e.g. "4H").
+    derived maps a new field name to (source field, function) and is applied
+    after unpacking, e.g. to split bitfields.
+    """
+
+    def __init__(
+        self,
+        offsets: dict,
+        record_size: int,
+        formats: dict[str, str] | None = None,
+        derived: dict[str, tuple[str, Callable]] | None = None,
+    ):
+        self.offsets = offsets
+        self.record_size = record_size
+        self.formats = formats or {}
+        self.derived = derived or {}
+
+        self.fields = []  # (name, index of first value, value count or None)
+        self.struct = struct.Struct(self._compile())
+
+    def _compile(self) -> str:
+        fmt = ["<"]
+        position = 0
+        value_index = 0
+
+        for name, (start, stop) in sorted(self.offsets.items(), key=lambda f: f[1]):
+            if start < position:
+                raise ValueError(f"Field {name} overlaps the previous field")
+            if start > position:
+                fmt.append(f"{start - position}x")
+
+            width = stop - start
+            code = self.formats.get(name)
+            if code is None:
+                code = _SCALAR_CODES.get(width, f"{width}B")
+
+            if struct.calcsize(f"<{code}") != width:
+                raise ValueError(f"Format {code} for {name} is not {width} bytes")
+
+            values = len(struct.unpack(f"<{code}", bytes(width)))
+            is_scalar = values == 1 and code in _SCALAR_CODES.values()
+            self.fields.append((name, value_index, None if is_scalar else values))
+
+            fmt.append(code)
+            position = stop
+            value_index += values
+
+        if position > self.record_size:
+            raise ValueError("Fields extend past the end of the record")
+        if position < self.record_size:
+            fmt.append(f"{self.record_size - position}x")
+
+        return "".join(fmt)
+
+    def unpack(self, buffer: bytes | memoryview, offset: int = 0) -> dict:
+        """Decode the record at offset into a dict of field values."""
+        values = self.struct.unpack_from(buffer, offset)
+
+        record = {}
+        for name, index, count in self.fields:
+            if count is None:
+                record[name] = values[index]
+            else:
+                record[name] = values[index : index + count]
+
+        for name, (source, step) in self.derived.items():
+            record[name] = step(record[source])
+
+        return record
+
+
+def reorder_evs(ev_values: tuple) -> list[int]:
+    """Reorder raw EV bytes into HP, Atk, Def, SpA, SpD, Spe."""
+    return [ev_values[i] for i in (0, 1, 2, 4, 5, 3)]
+
+
+_BITFIELDS = {
+    "ev_list": ("evs", reorder_evs),
+    "iv_list": ("ivs_data", unpack_ivs),
+    "is_egg": ("ivs_data", is_egg),
+    "has_ha": ("ivs_data", has_ha),
+}
+
+PARTY_LAYOUT = RecordLayout(
+    POKEMON_OFFSETS,
+    POKEMON_SIZE,
+    formats={"moves": "4H"},
+    derived={**_BITFIELDS, "move_ids": ("moves", list)},
+)
+
+BOX_LAYOUT = RecordLayout(
+    BOXMON_OFFSETS,
+    BOXMON_SIZE,
+    derived={**_BITFIELDS, "move_ids": ("moves", unpack_moves)},
+)
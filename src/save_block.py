@@ -1,43 +1,79 @@
-from utils import get_slice
-from constants import SAVE_SECTION_SIZE, FINAL_SECTION_ID
+from utils import get_slice, int_from_slice
+from constants import (
+    SAVE_SECTION_SIZE,
+    FINAL_SECTION_ID,
+    SECTION_ID_OFFSET,
+    SAVE_INDEX_OFFSET,
+)
 from save_section import SaveSection
 
 
 class BaseBlock:
     def __init__(
-        self, raw_bytes: bytes, section_count: int, assign_ids: None | tuple = None
+        self, raw_bytes: memoryview, section_count: int, assign_ids: None | tuple = None
     ):
-        self.sections = []
-        self.section_map = {}
+        self.raw_bytes = raw_bytes
+        self.section_count = section_count
+        self.assign_ids = assign_ids
 
-        for i in range(section_count):
-            offset = i * SAVE_SECTION_SIZE
+        # Sections are only built the first time they are asked for
+        self._sections: dict[int, SaveSection] = {}
+        self._section_map: dict[int, int] | None = None
+
+    def read_footer_field(self, index: int, field_range: tuple) -> int:
+        """Read a footer field of the section at index without building it."""
+        offset = index * SAVE_SECTION_SIZE
+        start, stop = field_range
+        return int_from_slice(self.raw_bytes, (offset + start, offset + stop))
+
+    @property
+    def section_map(self) -> dict[int, int]:
+        """Map of section ID to the section's index within the block."""
+        if self._section_map is None:
+            if self.assign_ids:
+                ids = self.assign_ids[: self.section_count]
+            else:
+                ids = [
+                    self.read_footer_field(i, SECTION_ID_OFFSET)
+                    for i in range(self.section_count)
+                ]
+            self._section_map = {section_id: i for i, section_id in enumerate(ids)}
+        return self._section_map
+
+    @property
+    def sections(self) -> list[SaveSection]:
+        """All sections of the block, in the order they are stored."""
+        return [self.get_section_by_index(i) for i in range(self.section_count)]
+
+    def get_section_by_index(self, index: int) -> SaveSection:
+        if not 0 <= index < self.section_count:
+            raise IndexError(f"Section index {index} out of range.")
+
+        if index not in self._sections:
+            offset = index * SAVE_SECTION_SIZE
             byte_range = (offset, offset + SAVE_SECTION_SIZE)
-            section_data = get_slice(raw_bytes, byte_range)
-            section = SaveSection(i, section_data)
-            if assign_ids:
-                section.section_id = assign_ids[i]
-            self.sections.append(section)
-            self.section_map[section.section_id] = section
+            section = SaveSection(index, get_slice(self.raw_bytes, byte_range))
+            if self.assign_ids:
+                section.section_id = self.assign_ids[index]
+            self._sections[index] = section
+
+        return self._sections[index]
 
     def get_section(self, section_id: int) -> SaveSection:
         if section_id not in self.section_map:
             raise KeyError(f"Section ID {section_id} not found in dict.")
-        return self.section_map[section_id]
+        return self.get_section_by_index(self.section_map[section_id])
 
 
 class SaveBlock(BaseBlock):
-    def __init__(self, raw_bytes: bytes):
+    def __init__(self, raw_bytes: memoryview):
         super().__init__(raw_bytes, 14)
 
     def get_save_index(self):
-        return self.sections[FINAL_SECTION_ID].save_index
+        return self.read_footer_field(FINAL_SECTION_ID, SAVE_INDEX_OFFSET)
 
 
 class ExpandedBlock(BaseBlock):
-    def __init__(self, raw_bytes: bytes, assign_ids: None | tuple = (30, 31)):
+    def __init__(self, raw_bytes: memoryview, assign_ids: None | tuple = (30, 31)):
 
         super().__init__(raw_bytes, 2, assign_ids=assign_ids)
-
-    def get_section_by_index(self, index: int) -> SaveSection:
-        return self.sections[index]
@@ -1,22 +1,44 @@
+import hashlib
+
 from constants import (
     SAVE_FILE_SIZE,
     RTC_SAVE_SIZE,
     SAVE_SECTION_SIZE,
     CFRU_SECTIONS,
     SAVE_BLOCK_SIZE,
+    SECTION_COUNT,
 )
 
 from save_block import SaveBlock
 from save_block import ExpandedBlock
-from utils import get_slice
+from utils import get_slice, verify_section_checksums
+
+
+def trim_save(raw: memoryview) -> memoryview:
+    """The 128 KB save data, without the RTC footer some emulators append."""
+    if len(raw) == SAVE_FILE_SIZE:
+        return raw
+    if len(raw) == RTC_SAVE_SIZE:
+        return raw[:SAVE_FILE_SIZE]
+    raise ValueError(f"Unexpected save file size: {len(raw)} bytes")
+
+
+def save_digest(raw_bytes: bytes | memoryview) -> str:
+    """
+    SHA-256 of the trimmed save, so the same save identifies the same
+    results whether or not it has an RTC footer.
+    """
+    return hashlib.sha256(trim_save(memoryview(raw_bytes))).hexdigest()
 
 
 class SaveFile:
-    def __init__(self, raw_bytes: bytes):
-        self.raw = self._validate_and_trim(raw_bytes)
+    def __init__(self, raw_bytes: bytes | memoryview, verify_checksums: bool = False):
+        # Every block, section and mon record is a view into this one buffer
+        self.raw = trim_save(memoryview(raw_bytes))
+        self.verify_checksums = verify_checksums
 
         self.block_a_raw, self.block_b_raw = [
-            get_slice(raw_bytes, (i * SAVE_BLOCK_SIZE, (i + 1) * SAVE_BLOCK_SIZE))
+            get_slice(self.raw, (i * SAVE_BLOCK_SIZE, (i + 1) * SAVE_BLOCK_SIZE))
             for i in range(2)
         ]
 
@@ -30,14 +52,11 @@ class SaveFile:
         self.block_b = SaveBlock(self.block_b_raw)
         self.expanded_block = ExpandedBlock(self.cfru_raw)
 
-        self.active_block = self._get_active_block()
+        # Per-section checksum results for both blocks, filled in one pass on
+        # first use. The CFRU sections have no footer, so they are not checked.
+        self.section_checksums_ok = None
 
-    def _validate_and_trim(self, raw: bytes) -> bytes:
-        if len(raw) == SAVE_FILE_SIZE:
-            return raw
-        if len(raw) == RTC_SAVE_SIZE:
-            return raw[:SAVE_FILE_SIZE]
-        raise ValueError(f"Unexpected save file size: {len(raw)} bytes")
+        self.active_block = self._get_active_block()
 
     def _get_active_block(self):
         # Choose active block based on save index
@@ -58,4 +77,24 @@ class SaveFile:
         else:
             active_block = self.block_b
 
-        return active_block
+        if not self.verify_checksums:
+            return active_block
+
+        # Fall back to the older block if the newer one was half-written
+        fallback = self.block_b if active_block is self.block_a else self.block_a
+        for block in (active_block, fallback):
+            if self.is_block_valid(block):
+                return block
+
+        raise ValueError("Both blocks failed checksum verification.")
+
+    def is_block_valid(self, block: SaveBlock) -> bool:
+        """Return True if every section of the block passed its checksum."""
+        if self.section_checksums_ok is None:
+            self.section_checksums_ok = verify_section_checksums(
+                self.raw, 2 * SECTION_COUNT["Vanilla"]
+            )
+
+        count = SECTION_COUNT["Vanilla"]
+        start = 0 if block is self.block_a else count
+        return bool(self.section_checksums_ok[start : start + count].all())
@@ -6,11 +6,11 @@ from constants import (
     SECTION_ID_OFFSET,
 )
 
-from utils import get_slice, int_from_slice
+from utils import int_from_slice
 
 
 class SaveSection:
-    def __init__(self, index: int, raw_bytes: bytes):
+    def __init__(self, index: int, raw_bytes: memoryview):
         if len(raw_bytes) != SAVE_SECTION_SIZE:
             raise ValueError(
                 f"Section must be {SAVE_SECTION_SIZE} bytes, got {len(raw_bytes)}"
@@ -20,10 +20,8 @@ class SaveSection:
         self.raw_bytes = raw_bytes
         self.data = raw_bytes[:SECTION_DATA_SIZE]
 
-        self.checksum = int.from_bytes(get_slice(raw_bytes, CHECKSUM_OFFSET), "little")
+        self.checksum = int_from_slice(raw_bytes, CHECKSUM_OFFSET)
 
-        self.save_index = int.from_bytes(
-            get_slice(raw_bytes, SAVE_INDEX_OFFSET), "little"
-        )
+        self.save_index = int_from_slice(raw_bytes, SAVE_INDEX_OFFSET)
 
         self.section_id = int_from_slice(raw_bytes, SECTION_ID_OFFSET)
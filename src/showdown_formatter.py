@@ -1,42 +1,179 @@
 from data_manager import GameDataManager
-from pokemon import Pokemon
-import requests
-from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont
-from collections import Counter
-import numpy as np
+from pokemon import Pokemon, PokemonTable
+from constants import NATURES
+from io import BytesIO, StringIO
+from typing import Callable, Iterable, Iterator
+from PIL import Image
 from paths import BasePaths
+from cache import LRUCache
+from sprite_store import CANVAS_COLOR, SPRITE_SIZE, SpriteStore, prepare_sprite
+from sprite_atlas import SpriteAtlas
+from text_layout import TextLayout
+from image_encoding import ImageEncoding, get_encoding
 
 paths = BasePaths()
 
+STAT_LABELS = ("HP", "Atk", "Def", "SpA", "SpD", "Spe")
+
 
 class ShowdownFormatter:
-    def __init__(self, data: GameDataManager, export_level: int | None = None):
+    # Formatted blocks keyed by (raw record bytes, export level), shared by
+    # every formatter so repeat uploads and Streamlit reruns hit it
+    format_cache = LRUCache(maxsize=4096)
+
+    # Decoded party sprites, backed by the on-disk sprite cache
+    sprite_store = SpriteStore()
+    sprite_atlas = SpriteAtlas()
+
+    # Laid-out text lines in the team image font
+    text_layout = TextLayout(paths.fonts.pixeloperator, 16)
+
+    # Rendered team image cards keyed by (raw record bytes, export level,
+    # tile size), so only new or changed party members are redrawn
+    tile_cache = LRUCache(maxsize=256)
+
+    def __init__(
+        self,
+        data: GameDataManager,
+        export_level: int | None = None,
+        image_encoding: str | ImageEncoding = "png",
+    ):
         self.data = data
         self.export_level = export_level
+        self.image_encoding = get_encoding(image_encoding)
+
+        # Species left out of the last team image because of missing sprites
+        self.missing_sprites: list[int] = []
 
     def format(self, p: Pokemon) -> str:
-        species = self.data.get_species_name(p.species_id)
+        # Mons built by hand have no raw record to key on
+        if not p.raw_data:
+            return self._format(p)
+
+        key = (bytes(p.raw_data), self.export_level)
+        text = self.format_cache.get(key)
+        if text is None:
+            text = self._format(p)
+            self.format_cache.put(key, text)
+        return text
+
+    def iter_format(self, mons: Iterable[Pokemon]) -> Iterator[str]:
+        """Format mons lazily, one Showdown block per mon."""
+        for mon in mons:
+            yield self.format(mon)
+
+    def _format(self, p: Pokemon) -> str:
+        record = self.data.get_species_record(p.species_id)
+        species = record.name
         held_item = self.data.get_item_name(p.held_item_id)
         moves = [self.data.get_move_name(m) for m in p.move_ids]
-        ability = self.data.get_ability_name(p.ability_index, species, p.has_ha_flag)
+        ability = record.ability_name(p.ability_index, p.has_ha_flag)
 
         level = p.level if self.export_level is None else self.export_level
 
+        evs_str = self._stat_string(tuple(p.evs.to_dict().values()), lambda v: v > 0)
+        ivs_str = self._stat_string(tuple(p.ivs.to_dict().values()), lambda v: v != 31)
+
+        return self._block(
+            p.nickname,
+            species,
+            held_item,
+            level,
+            p.nature,
+            ability,
+            ivs_str,
+            evs_str,
+            moves,
+        )
+
+    def format_table(self, table: PokemonTable) -> list[str]:
+        """Format every mon of a table; each block equals format(mon)."""
+        return list(self._iter_table_blocks(table))
+
+    def export_table(self, table: PokemonTable) -> str:
+        """
+        Format a whole party or storage into one text buffer in a single pass.
+        Equal to "\n".join(format(mon) for mon in table).
+        """
+        buffer = StringIO()
+        for i, block in enumerate(self._iter_table_blocks(table)):
+            if i:
+                buffer.write("\n")
+            buffer.write(block)
+        return buffer.getvalue()
+
+    def _iter_table_blocks(self, table: PokemonTable) -> Iterator[str]:
+        """Yield Showdown blocks, resolving every name by bulk gathering."""
+        species_table = self.data.species_table
+        species = species_table.gather_names(table.species_id)
+        abilities = species_table.gather_ability_names(
+            table.species_id, table.ability_index, table.has_ha_flag
+        )
+        held_items = self.data.get_item_names(table.held_item_id)
+        moves = self.data.get_move_names(table.move_ids)
+
+        if self.export_level is None:
+            levels = table.level.tolist()
+        else:
+            levels = [self.export_level] * len(table)
+
+        ev_strings = {(0,) * 6: ""}
+        iv_strings = {(31,) * 6: ""}
+
+        rows = zip(
+            table.nicknames,
+            species.tolist(),
+            held_items.tolist(),
+            levels,
+            table.nature_index.tolist(),
+            abilities.tolist(),
+            map(tuple, table.ivs.tolist()),
+            map(tuple, table.evs.tolist()),
+            moves.tolist(),
+        )
+        for nickname, name, held_item, level, nature, ability, ivs, evs, mons in rows:
+            ivs_str = iv_strings.get(ivs)
+            if ivs_str is None:
+                ivs_str = iv_strings[ivs] = self._stat_string(ivs, lambda v: v != 31)
+
+            evs_str = ev_strings.get(evs)
+            if evs_str is None:
+                evs_str = ev_strings[evs] = self._stat_string(evs, lambda v: v > 0)
+
+            yield self._block(
+                nickname,
+                name,
+                held_item,
+                level,
+                NATURES[nature],
+                ability,
+                ivs_str,
+                evs_str,
+                mons,
+            )
+
+    @staticmethod
+    def _block(
+        nickname: str,
+        species: str,
+        held_item: str,
+        level: int,
+        nature: str,
+        ability: str | None,
+        ivs_str: str,
+        evs_str: str,
+        moves: list[str],
+    ) -> str:
+        """Assemble one Showdown block from already resolved fields."""
         name_line = (
-            f"{p.nickname} ({species})"
-            if p.nickname and p.nickname != species
-            else species
+            f"{nickname} ({species})" if nickname and nickname != species else species
         )
         item_line = f" @ {held_item}" if held_item != "None" else ""
 
-        evs_str = " / ".join(f"{v} {k}" for k, v in p.evs.to_dict().items() if v > 0)
-        ivs_str = " / ".join(f"{v} {k}" for k, v in p.ivs.to_dict().items() if v != 31)
-
         lines = [
             f"{name_line}{item_line}",
             f"Level: {level}",
-            f"{p.nature} Nature",
+            f"{nature} Nature",
             f"Ability: {ability or 'Unknown'}",
         ]
         if ivs_str:
@@ -47,8 +184,12 @@ class ShowdownFormatter:
 
         return "\n".join(lines) + "\n"
 
+    @staticmethod
+    def _stat_string(values: tuple, shown: Callable[[int], bool]) -> str:
+        """Build "252 HP / 4 Def" style text for the stats where shown(v)."""
+        return " / ".join(f"{v} {k}" for k, v in zip(STAT_LABELS, values) if shown(v))
+
     def format_image(self, party: list[Pokemon]) -> Image.Image:
-        sprite_size = (96, 96)
         spacing_x = 45
         spacing_y = 10
         padding_x = 20
@@ -59,207 +200,84 @@ class ShowdownFormatter:
         box_width = 400
         image_width = col_count * box_width + spacing_x * col_count + padding_x
 
-        row_height = sprite_size[1] + 100
+        row_height = SPRITE_SIZE[1] + 100
         content_height = (row_count * row_height) + (spacing_y * (row_count - 1))
         image_height = content_height + (padding_y)
 
-        canvas = Image.new("RGBA", (image_width, image_height), (18, 18, 18, 255))
-        draw = ImageDraw.Draw(canvas)
-
-        try:
-            font = ImageFont.truetype(paths.fonts.pixeloperator, 16)
+        canvas = Image.new("RGBA", (image_width, image_height), (*CANVAS_COLOR, 255))
 
-        except Exception as e:  # noqa
-            print(e)
+        # Each card fills its cell, so the canvas is only composited tiles
+        tile_size = (box_width + spacing_x, row_height)
+        self.missing_sprites = []
 
         for idx, p in enumerate(party):
             col = idx % col_count
             row = idx // col_count
-            x = col * (box_width + spacing_x)
 
             # Only add spacing_y for rows that aren't the last row
             x = padding_x + col * (box_width + spacing_x)
             y = padding_y + (row * row_height) + (spacing_y * row)
 
-            try:
-                if p.sprite_url.startswith("http"):
-                    response = requests.get(p.sprite_url)
-                    sprite = Image.open(BytesIO(response.content)).convert("RGBA")
-                else:
-                    sprite = Image.open(p.sprite_url).convert("RGBA")
-
-                # Get border pixels to determine background color
-                width, height = sprite.size
-                border_pixels = []
-                for border_y in range(height):
-                    border_pixels.append(sprite.getpixel((0, border_y)))
-                    border_pixels.append(sprite.getpixel((width - 1, border_y)))
-                for border_x in range(width):
-                    border_pixels.append(sprite.getpixel((border_x, 0)))
-                    border_pixels.append(sprite.getpixel((border_x, height - 1)))
-
-                # Find most common border color
-                bg_color = Counter(border_pixels).most_common(1)[0][0]
-
-                # Make matching pixels transparent
-                data = sprite.getdata()
-                new_data = []
-                for item in data:
-
-                    if item[:3] == bg_color[:3]:
-                        new_data.append((0, 0, 0, 0))
-                    else:
-                        new_data.append(item)
-                sprite.putdata(new_data)
-
-            except Exception as e:
-                print(f"Could not load sprite for species ID {p.species_id}: {e}")
-                continue
-
-            sprite = sprite.resize(sprite_size)
-            canvas.paste(sprite, (x, y), sprite)
-
-            sprite_array = np.array(sprite)
-
-            mask = sprite_array[..., 3] > 0
-
-            if mask.any():
-
-                avg_color = np.mean(sprite_array[mask][:, :3], axis=0)
-
-                brightness = (
-                    avg_color[0] * 299 + avg_color[1] * 587 + avg_color[2] * 114
-                ) / 1000
-                bg_brightness = (18 * 299 + 18 * 587 + 18 * 114) / 1000
-
-                min_contrast = 164
-                if abs(brightness - bg_brightness) < min_contrast:
-                    adjustment = 1.5
-                    avg_color = np.minimum(255, avg_color * adjustment)
-
-                dominant_color = tuple(map(int, avg_color))
+            tile = self.card_tile(p, tile_size)
+            if tile is None:
+                self.missing_sprites.append(p.species_id)
             else:
-                dominant_color = (255, 255, 255)
-
-            # Showdown text
-            text_x = x + sprite_size[0] + 10
-            text_y = y
-            showdown_text = self.format(p).strip().split("\n")
-
-            # Color definitions
-            text_color = (255, 255, 255)  # White for main text
-            label_color = (170, 170, 170)  # Light grey for labels
-            stat_colors = {
-                "HP": (255, 0, 0),  # Red
-                "Atk": (240, 128, 48),  # Orange
-                "Def": (248, 208, 48),  # Yellow
-                "SpA": (104, 144, 240),  # Blue
-                "SpD": (120, 200, 80),  # Green
-                "Spe": (248, 88, 136),  # Pink
-            }
-
-            # Draw each line with appropriate color
-            for i, line in enumerate(showdown_text):
-                if i == 0:  # First line is Pokemon name/species
-                    draw.text(
-                        (text_x, text_y),
-                        line,
-                        font=font,
-                        fill=dominant_color,
-                        stroke_width=0,
-                        stroke_fill=None,
-                    )
-                elif line.startswith("EVs:"):
-                    current_x = text_x
-                    # Draw the "EVs:" label in grey
-                    draw.text((current_x, text_y), "EVs:", font=font, fill=label_color)
-                    current_x += font.getlength("EVs: ")
-
-                    # Split the EV values
-                    ev_parts = line[4:].strip().split(" / ")
-
-                    for i, ev_part in enumerate(ev_parts):
-                        # For each stat (e.g., "252 HP")
-                        value, stat = ev_part.strip().split(" ")
-
-                        # Draw the value and stat in the stat's color
-                        stat_text = f"{value} {stat}"
-                        draw.text(
-                            (current_x, text_y),
-                            stat_text,
-                            font=font,
-                            fill=stat_colors[stat],
-                        )
-                        current_x += font.getlength(stat_text)
-
-                        # Draw slash in white if not the last stat
-                        if i < len(ev_parts) - 1:
-                            draw.text(
-                                (current_x, text_y), " / ", font=font, fill=text_color
-                            )
-                            current_x += font.getlength(" / ")
-
-                elif line.startswith("IVs:"):
-                    current_x = text_x
-                    # Draw the "IVs:" label in grey
-                    draw.text((current_x, text_y), "IVs:", font=font, fill=label_color)
-                    current_x += font.getlength("IVs: ")
-
-                    # Split the IV values
-                    iv_parts = line[4:].strip().split(" / ")
-
-                    for i, iv_part in enumerate(iv_parts):
-                        # For each stat (e.g., "0 Atk")
-                        value, stat = iv_part.strip().split(" ")
-
-                        # Draw the value and stat in the stat's color
-                        stat_text = f"{value} {stat}"
-                        draw.text(
-                            (current_x, text_y),
-                            stat_text,
-                            font=font,
-                            fill=stat_colors[stat],
-                        )
-                        current_x += font.getlength(stat_text)
-
-                        # Draw slash in white if not the last stat
-                        if i < len(iv_parts) - 1:
-                            draw.text(
-                                (current_x, text_y), " / ", font=font, fill=text_color
-                            )
-                            current_x += font.getlength(" / ")
-                elif any(label in line for label in ["Level:", "Nature", "Ability:"]):
-                    # Split the line at the colon if present
-                    if ":" in line:
-                        label, value = line.split(":", 1)
-                        draw.text(
-                            (text_x, text_y), f"{label}:", font=font, fill=label_color
-                        )
-                        draw.text(
-                            (text_x + font.getlength(f"{label}:"), text_y),
-                            value,
-                            font=font,
-                            fill=text_color,
-                        )
-                    else:
-                        draw.text((text_x, text_y), line, font=font, fill=label_color)
-                else:
-                    draw.text(
-                        (text_x, text_y),
-                        line,
-                        font=font,
-                        fill=text_color,
-                        stroke_width=0,
-                        stroke_fill=None,
-                    )
-
-                text_y += font.getbbox(line)[3] + 2
+                canvas.paste(tile, (x, y))
 
         return canvas
 
-    def get_image_bytes(self, party: list[Pokemon]) -> BytesIO:
+    def card_tile(self, p: Pokemon, size: tuple[int, int]) -> Image.Image | None:
+        """The rendered card of one mon, or None if its sprite can't be loaded."""
+        # Mons built by hand have no raw record to key on
+        if not p.raw_data:
+            return self._render_card(p, size)
+
+        key = (bytes(p.raw_data), self.export_level, size)
+        tile = self.tile_cache.get(key)
+        if tile is None:
+            tile = self._render_card(p, size)
+            if tile is not None:
+                self.tile_cache.put(key, tile)
+        return tile
+
+    def prepared_sprite(self, p: Pokemon) -> tuple[Image.Image, tuple] | None:
+        """The 96x96 sprite and name colour of a mon, None if it can't be loaded."""
+        # Prebuilt sprites come straight from the atlas
+        prepared = self.sprite_atlas.get(p.species_id)
+        if prepared is None:
+            sprite = self.sprite_store.get(p.species_id, p.sprite_url)
+            if sprite is None:
+                return None
+            prepared = prepare_sprite(sprite)
+        return prepared
+
+    def _render_card(self, p: Pokemon, size: tuple[int, int]) -> Image.Image | None:
+        prepared = self.prepared_sprite(p)
+        if prepared is None:
+            return None
+
+        sprite, dominant_color = prepared
+        tile = Image.new("RGBA", size, (*CANVAS_COLOR, 255))
+        tile.paste(sprite, (0, 0), sprite)
+
+        # Showdown text, each line blitted from the layout cache
+        text_x = SPRITE_SIZE[0] + 10
+        text_y = 0
+        showdown_text = self.format(p).strip().split("\n")
+
+        for i, line in enumerate(showdown_text):
+            name_color = dominant_color if i == 0 else None
+            text_y += self.text_layout.draw_line(
+                tile, (text_x, text_y), line, name_color
+            )
+
+        return tile
+
+    def get_image_bytes(
+        self, party: list[Pokemon], encoding: str | ImageEncoding | None = None
+    ) -> BytesIO:
+        """The team image encoded with encoding, or the formatter's default."""
         img = self.format_image(party)
-        buf = BytesIO()
-        img.save(buf, format="PNG")
-        buf.seek(0)
-        return buf
+        if encoding is None:
+            return self.image_encoding.encode(img)
+        return get_encoding(encoding).encode(img)
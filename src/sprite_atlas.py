@@ -0,0 +1,119 @@
+import os
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+from PIL import Image
+
+from constants import SPRITE_URL
+from sprite_store import SPRITE_DIR, SPRITE_SIZE, SpriteStore, prepare_sprite
+
+ATLAS_PATH = SPRITE_DIR / "atlas.npy"
+ATLAS_META_PATH = SPRITE_DIR / "atlas_meta.npy"
+
+# One row per species ID: whether it has a sprite, and its name colour
+META_DTYPE = np.dtype([("present", "?"), ("color", "u1", (3,))])
+
+
+def build_atlas(
+    species_count: int,
+    store: SpriteStore | None = None,
+    path: Path = ATLAS_PATH,
+    meta_path: Path = ATLAS_META_PATH,
+) -> int:
+    """
+    Process the sprite of every species ID up to species_count once: load it
+    through the store, remove the background, resize it and pick its name
+    colour. Sprites are packed into one (species, 96, 96, 4) RGBA array with a
+    sidecar metadata table. Returns the number of species with a sprite.
+    """
+    store = store or SpriteStore()
+    width, height = SPRITE_SIZE
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp.npy")
+    atlas = np.lib.format.open_memmap(
+        tmp_path, mode="w+", dtype=np.uint8, shape=(species_count, height, width, 4)
+    )
+    meta = np.zeros(species_count, dtype=META_DTYPE)
+
+    for species_id in range(species_count):
+        url = SPRITE_URL.format(species_id=species_id)
+        sprite = store.get(species_id, url, quiet=True)
+        if sprite is None:
+            continue
+
+        sprite, color = prepare_sprite(sprite)
+        atlas[species_id] = np.asarray(sprite)
+        meta[species_id] = (True, color)
+
+        # Sprites are only needed once, don't let the store hold on to them
+        store.memory.clear()
+
+    atlas.flush()
+    del atlas
+    os.replace(tmp_path, path)
+    np.save(meta_path, meta)
+
+    return int(meta["present"].sum())
+
+
+class SpriteAtlas:
+    """
+    Memory-mapped view of the prebuilt sprite atlas. Sprites are pasted
+    straight from it, so a render does no image decoding or colour work.
+    """
+
+    def __init__(self, path: Path = ATLAS_PATH, meta_path: Path = ATLAS_META_PATH):
+        self.path = path
+        self.meta_path = meta_path
+        self._atlas: np.ndarray | None = None
+        self._meta: np.ndarray | None = None
+        self._loaded = False
+
+        # Renders look sprites up from several threads at once
+        self._load_lock = Lock()
+
+    def _load(self) -> None:
+        try:
+            atlas = np.load(self.path, mmap_mode="r")
+            meta = np.load(self.meta_path)
+        except (OSError, ValueError):
+            return
+
+        if meta.dtype != META_DTYPE or len(meta) != len(atlas):
+            print(f"Ignoring sprite atlas {self.path.name}: metadata does not match")
+            return
+
+        self._atlas, self._meta = atlas, meta
+
+    @property
+    def available(self) -> bool:
+        if not self._loaded:
+            with self._load_lock:
+                # Only marked loaded once the atlas is assigned, so no thread
+                # sees a half-loaded atlas and falls back to the sprite store
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+        return self._atlas is not None
+
+    def get(self, species_id: int) -> tuple[Image.Image, tuple[int, int, int]] | None:
+        """The prepared sprite and name colour of a species, if the atlas has it."""
+        if not self.available or not 0 <= species_id < len(self._meta):
+            return None
+
+        row = self._meta[species_id]
+        if not row["present"]:
+            return None
+
+        sprite = Image.fromarray(self._atlas[species_id], "RGBA")
+        return sprite, tuple(row["color"].tolist())
+
+
+if __name__ == "__main__":
+    from data_manager import GameDataManager
+
+    species_count = len(GameDataManager().species_table)
+    built = build_atlas(species_count)
+    print(f"Packed {built} of {species_count} sprites into {ATLAS_PATH}")
@@ -0,0 +1,255 @@
+import os
+import shutil
+import sys
+import tempfile
+import time
+from io import BytesIO
+from pathlib import Path
+from threading import Lock
+
+import numpy as np
+import requests
+from PIL import Image
+
+from cache import LRUCache
+
+SPRITE_DIR = Path(__file__).parent.parent / "sprites"
+REQUEST_TIMEOUT = 10  # seconds
+FAILURE_TTL = 60  # seconds before a sprite that failed to load is tried again
+RGB_MASK = np.uint32(0x00FFFFFF)
+
+SPRITE_SIZE = (96, 96)
+CANVAS_COLOR = (18, 18, 18)
+MIN_CONTRAST = 164
+
+
+def border_pixels(pixels: np.ndarray) -> np.ndarray:
+    """
+    The (n, channels) border pixels of an (h, w, channels) image: left and
+    right columns interleaved top to bottom, then top and bottom rows left
+    to right. Ties for the background colour go to the first in this order.
+    """
+    channels = pixels.shape[-1]
+    columns = np.stack([pixels[:, 0], pixels[:, -1]], axis=1).reshape(-1, channels)
+    rows = np.stack([pixels[0], pixels[-1]], axis=1).reshape(-1, channels)
+    return np.concatenate([columns, rows])
+
+
+def remove_background(sprite: Image.Image) -> Image.Image:
+    """Make every pixel matching the most common border colour transparent."""
+    pixels = np.array(sprite.convert("RGBA"))
+
+    # One little-endian word per pixel, RGB in the low three bytes
+    words = pixels.view("<u4")[..., 0]
+    border = border_pixels(words[..., None]).ravel()
+
+    # Most common border colour, ties going to the one seen first
+    _, first_seen, counts = np.unique(border, return_index=True, return_counts=True)
+    bg_color = border[first_seen[counts == counts.max()].min()]
+
+    # Make matching pixels transparent
+    words[(words & RGB_MASK) == (bg_color & RGB_MASK)] = 0
+    return Image.fromarray(pixels, "RGBA")
+
+
+def name_color(sprite: np.ndarray) -> tuple[int, int, int]:
+    """
+    Colour for a mon's name: the mean colour of the sprite's visible
+    pixels, brightened if it would be too close to the canvas.
+    """
+    mask = sprite[..., 3] > 0
+    if not mask.any():
+        return (255, 255, 255)
+
+    avg_color = np.mean(sprite[mask][:, :3], axis=0)
+
+    brightness = (avg_color[0] * 299 + avg_color[1] * 587 + avg_color[2] * 114) / 1000
+    red, green, blue = CANVAS_COLOR
+    bg_brightness = (red * 299 + green * 587 + blue * 114) / 1000
+
+    if abs(brightness - bg_brightness) < MIN_CONTRAST:
+        adjustment = 1.5
+        avg_color = np.minimum(255, avg_color * adjustment)
+
+    return tuple(map(int, avg_color))
+
+
+def prepare_sprite(sprite: Image.Image) -> tuple[Image.Image, tuple[int, int, int]]:
+    """Resize a background-removed sprite for the team image and pick its name colour."""
+    sprite = sprite.resize(SPRITE_SIZE)
+    return sprite, name_color(np.array(sprite))
+
+
+class SpriteStore:
+    """
+    Sprites keyed by species ID, looked up in a bounded in-memory LRU of
+    decoded RGBA images, then a disk cache directory, then the network.
+    Downloads are written to the disk cache, so a warm lookup does no I/O.
+    Failed loads are remembered for failure_ttl seconds, so a missing sprite
+    doesn't wait out the request timeout on every render.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = SPRITE_DIR,
+        maxsize: int = 64,
+        allow_network: bool = True,
+        failure_ttl: float = FAILURE_TTL,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.allow_network = allow_network
+        self.failure_ttl = failure_ttl
+        self.memory = LRUCache(maxsize)
+
+        # Species ID -> time.monotonic() after which it is tried again
+        self.failed = LRUCache(1024)
+
+        self.disk_hits = 0
+        self.downloads = 0
+        self.failures = 0
+        self.skipped = 0
+
+        # Guards the counters and the per-species load locks
+        self._lock = Lock()
+        self._loading: dict[int, Lock] = {}
+
+    def sprite_path(self, species_id: int) -> Path:
+        return self.cache_dir / f"{species_id}.png"
+
+    def get(
+        self, species_id: int, url: str | None = None, quiet: bool = False
+    ) -> Image.Image | None:
+        """
+        The decoded sprite with its background removed, or None if it can't
+        be loaded (reported unless quiet). The image is shared between callers
+        and must not be modified in place.
+        """
+        sprite = self.memory.get(species_id)
+        if sprite is not None:
+            return sprite
+
+        # One load per species at a time: renders running on several threads
+        # wait for it instead of downloading the same sprite again
+        with self._lock:
+            loading = self._loading.setdefault(species_id, Lock())
+        with loading:
+            try:
+                return self._get_once(species_id, url, quiet)
+            finally:
+                with self._lock:
+                    self._loading.pop(species_id, None)
+
+    def _get_once(
+        self, species_id: int, url: str | None, quiet: bool
+    ) -> Image.Image | None:
+        # Loaded or failed while this thread waited for the species' lock
+        sprite = self.memory.peek(species_id)
+        if sprite is not None:
+            return sprite
+
+        retry_at = self.failed.peek(species_id)
+        if retry_at is not None and time.monotonic() < retry_at:
+            self._count("skipped")
+            return None
+
+        try:
+            sprite = remove_background(self._load(species_id, url))
+        except Exception as e:
+            self._count("failures")
+            self.failed.put(species_id, time.monotonic() + self.failure_ttl)
+            if not quiet:
+                print(f"Could not load sprite for species ID {species_id}: {e}")
+            return None
+
+        self.memory.put(species_id, sprite)
+        return sprite
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _load(self, species_id: int, url: str | None) -> Image.Image:
+        path = self.sprite_path(species_id)
+        if path.is_file():
+            self._count("disk_hits")
+            return Image.open(path).convert("RGBA")
+
+        if url is None:
+            raise FileNotFoundError(f"{path.name} is not in {self.cache_dir}")
+
+        if not url.startswith("http"):
+            return Image.open(url).convert("RGBA")
+
+        if not self.allow_network:
+            raise ConnectionError(f"{path.name} is not cached and network is off")
+
+        response = requests.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        self._count("downloads")
+
+        sprite = Image.open(BytesIO(response.content)).convert("RGBA")
+        self._write(path, response.content)
+        return sprite
+
+    def _write(self, path: Path, content: bytes) -> None:
+        # A temp file per writer, as worker processes may fetch the same sprite
+        tmp_path = None
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp", delete=False
+            ) as tmp:
+                tmp_path = Path(tmp.name)
+                tmp.write(content)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not cache sprite {path.name}: {e}")
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+    def prefill(self, sprite_pack: Path) -> int:
+        """
+        Copy a local sprite pack (files named <species ID>.png) into the disk
+        cache, so rendering works offline. Returns the number of sprites copied.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        copied = 0
+        for source in Path(sprite_pack).glob("*.png"):
+            if not source.stem.isdigit():
+                continue
+            shutil.copyfile(source, self.sprite_path(int(source.stem)))
+            copied += 1
+        return copied
+
+    def clear(self) -> None:
+        """Drop the in-memory sprites and failures, and reset the counters."""
+        self.memory.clear()
+        self.failed.clear()
+        with self._lock:
+            self.disk_hits = self.downloads = self.failures = self.skipped = 0
+
+    @property
+    def stats(self) -> dict:
+        """Counters for instrumentation."""
+        memory = self.memory.stats
+        lookups = memory["hits"] + memory["misses"]
+        local_hits = memory["hits"] + self.disk_hits
+        return {
+            "memory": memory,
+            "disk_hits": self.disk_hits,
+            "downloads": self.downloads,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "local_hit_ratio": local_hits / lookups if lookups else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Usage: python {Path(__file__).name} <sprite pack directory>")
+        sys.exit(1)
+
+    store = SpriteStore()
+    copied = store.prefill(Path(sys.argv[1]))
+    print(f"Copied {copied} sprites into {store.cache_dir}")
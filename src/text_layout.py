@@ -0,0 +1,142 @@
+import math
+from functools import lru_cache
+from threading import Lock
+
+from PIL import Image, ImageDraw, ImageFont
+
+from cache import LRUCache
+
+# Color definitions
+TEXT_COLOR = (255, 255, 255)  # White for main text
+LABEL_COLOR = (170, 170, 170)  # Light grey for labels
+STAT_COLORS = {
+    "HP": (255, 0, 0),  # Red
+    "Atk": (240, 128, 48),  # Orange
+    "Def": (248, 208, 48),  # Yellow
+    "SpA": (104, 144, 240),  # Blue
+    "SpD": (120, 200, 80),  # Green
+    "Spe": (248, 88, 136),  # Pink
+}
+LINE_SPACING = 2
+
+Color = tuple[int, int, int]
+
+
+@lru_cache(maxsize=None)
+def load_font(path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load a TrueType font once per process."""
+    return ImageFont.truetype(path, size)
+
+
+def segment_line(
+    line: str, font: ImageFont.FreeTypeFont, name_color: Color | None = None
+) -> list[tuple[float, str, Color]]:
+    """
+    Split one line of a Showdown block into (x offset, text, colour) runs.
+    name_color is given for the first line, which is drawn in one colour.
+    """
+    if name_color is not None:
+        return [(0, line, name_color)]
+
+    if line.startswith(("EVs:", "IVs:")):
+        # Draw the label in grey, then each "252 HP" in the stat's colour
+        label = line[:4]
+        segments = [(0, label, LABEL_COLOR)]
+        current_x = font.getlength(f"{label} ")
+
+        parts = line[4:].strip().split(" / ")
+        for i, part in enumerate(parts):
+            value, stat = part.strip().split(" ")
+            stat_text = f"{value} {stat}"
+            segments.append((current_x, stat_text, STAT_COLORS[stat]))
+            current_x += font.getlength(stat_text)
+
+            # Slash in white if not the last stat
+            if i < len(parts) - 1:
+                segments.append((current_x, " / ", TEXT_COLOR))
+                current_x += font.getlength(" / ")
+        return segments
+
+    if any(label in line for label in ["Level:", "Nature", "Ability:"]):
+        # Split the line at the colon if present
+        if ":" not in line:
+            return [(0, line, LABEL_COLOR)]
+        label, value = line.split(":", 1)
+        return [
+            (0, f"{label}:", LABEL_COLOR),
+            (font.getlength(f"{label}:"), value, TEXT_COLOR),
+        ]
+
+    return [(0, line, TEXT_COLOR)]
+
+
+class RenderedLine:
+    """
+    A laid-out line: one coverage mask per colour, placed relative to the
+    line's origin, plus how far the next line starts below it.
+    """
+
+    def __init__(self, line: str, font: ImageFont.FreeTypeFont, name_color: Color):
+        segments = segment_line(line, font, name_color)
+        self.advance = font.getbbox(line)[3] + LINE_SPACING
+
+        measure = ImageDraw.Draw(Image.new("L", (1, 1)))
+        boxes = [measure.textbbox((dx, 0), text, font=font) for dx, text, _ in segments]
+        self.left = min(math.floor(box[0]) for box in boxes)
+        self.top = min(math.floor(box[1]) for box in boxes)
+        size = (
+            max(math.ceil(box[2]) for box in boxes) - self.left,
+            max(math.ceil(box[3]) for box in boxes) - self.top,
+        )
+
+        # Runs never overlap, so runs of one colour can share a mask
+        masks: dict[Color, Image.Image] = {}
+        for dx, text, color in segments:
+            if color not in masks:
+                masks[color] = Image.new("L", size, 0)
+            ImageDraw.Draw(masks[color]).text(
+                (dx - self.left, -self.top), text, font=font, fill=255
+            )
+        self.masks = list(masks.items())
+
+    def draw(self, canvas: Image.Image, xy: tuple[int, int]) -> int:
+        """Blit the line onto the canvas; returns the height to advance by."""
+        x, y = xy
+        for color, mask in self.masks:
+            canvas.paste(color, (x + self.left, y + self.top), mask)
+        return self.advance
+
+
+class TextLayout:
+    """
+    Draws Showdown text with one font, caching every laid-out line by its
+    content so repeat lines (moves, natures, common spreads) are just blitted.
+    """
+
+    def __init__(self, font_path: str, size: int, maxsize: int = 2048):
+        self.font_path = font_path
+        self.size = size
+        self.lines = LRUCache(maxsize)
+
+        # FreeType faces are not safe to render from several threads at once
+        self._render_lock = Lock()
+
+    @property
+    def font(self) -> ImageFont.FreeTypeFont:
+        return load_font(self.font_path, self.size)
+
+    def draw_line(
+        self,
+        canvas: Image.Image,
+        xy: tuple[int, int],
+        line: str,
+        name_color: Color | None = None,
+    ) -> int:
+        """Draw one line at xy; returns the height to advance by."""
+        key = (line, name_color)
+        rendered = self.lines.get(key)
+        if rendered is None:
+            with self._render_lock:
+                rendered = RenderedLine(line, self.font, name_color)
+            self.lines.put(key, rendered)
+        return rendered.draw(canvas, xy)
@@ -1,45 +1,140 @@
 import math
-from constants import CHARACTER_MAP, NATURES
+from bisect import bisect_right
+from typing import Iterator
+import numpy as np
+from constants import (
+    CHARACTER_MAP,
+    NATURES,
+    GROWTH_RATES,
+    MAX_LEVEL,
+    SAVE_SECTION_SIZE,
+    SECTION_DATA_SIZE,
+    SECTION_ID_OFFSET,
+    SIGNATURE_OFFSET,
+    SECTION_SIGNATURE,
+    SECTION_CHECKSUM_SIZES,
+)
 
+_WORDS_PER_SECTION = SAVE_SECTION_SIZE // 4
+_DATA_WORDS = SECTION_DATA_SIZE // 4
+_ID_WORD = SECTION_ID_OFFSET[0] // 4
+_SIGNATURE_WORD = SIGNATURE_OFFSET[0] // 4
 
-def get_slice(raw_bytes: bytes, byte_range: tuple) -> bytes:
+# Row i masks the words covered by the checksum of section ID i
+_CHECKSUM_MASKS = np.zeros((len(SECTION_CHECKSUM_SIZES), _DATA_WORDS), dtype=np.uint64)
+for _sid, _size in SECTION_CHECKSUM_SIZES.items():
+    _CHECKSUM_MASKS[_sid, : _size // 4] = 1
+
+
+def get_slice(
+    raw_bytes: bytes | memoryview, byte_range: tuple
+) -> bytes | memoryview:
+    """Slice raw bytes. Slicing a memoryview returns a view, not a copy."""
     start, stop = byte_range
     return raw_bytes[start:stop]
 
 
-def split_into_chunks(
-    raw_bytes: bytes, chunk_size: int, skip_empty: bool = True
-) -> list[bytes]:
-    """Split raw bytes into chunks of specified size."""
+def iter_chunks(
+    raw_bytes: bytes | memoryview, chunk_size: int, skip_empty: bool = True
+) -> Iterator[memoryview]:
+    """Yield chunks of specified size one at a time, as views over raw_bytes."""
     if len(raw_bytes) % chunk_size != 0:
         raise ValueError(
             f"Raw bytes length {len(raw_bytes)} is not a multiple of chunk size {chunk_size}"
         )
 
-    chunks = []
+    view = memoryview(raw_bytes)
 
-    for i in range(0, len(raw_bytes), chunk_size):
-        chunk = raw_bytes[i : i + chunk_size]
+    for i in range(0, len(view), chunk_size):
+        chunk = view[i : i + chunk_size]
         if skip_empty and chunk[0] == 0:
             continue
-        chunks.append(chunk)
+        yield chunk
+
 
-    return chunks
+def split_into_chunks(
+    raw_bytes: bytes | memoryview, chunk_size: int, skip_empty: bool = True
+) -> list[memoryview]:
+    """Split raw bytes into chunks of specified size, as views over raw_bytes."""
+    return list(iter_chunks(raw_bytes, chunk_size, skip_empty))
 
 
-def int_from_slice(raw_bytes: bytes, byte_range: tuple) -> int:
+def int_from_slice(raw_bytes: bytes | memoryview, byte_range: tuple) -> int:
     """Extract an integer from a slice of raw bytes."""
     return int.from_bytes(get_slice(raw_bytes, byte_range), "little")
 
 
-def decode_gba_string(data: bytes) -> str:
+def verify_section_checksums(
+    raw_bytes: bytes | memoryview, section_count: int
+) -> np.ndarray:
+    """
+    Verify the footers of consecutive 4 KB sections in one batched pass.
+    Returns a bool array with one entry per section: True when the section
+    ID is known, the signature matches and the stored checksum equals the
+    Gen III 32-bit word sum folded to 16 bits.
+    """
+    words = np.frombuffer(
+        raw_bytes, dtype="<u4", count=section_count * _WORDS_PER_SECTION
+    ).reshape(section_count, _WORDS_PER_SECTION)
+
+    # Footer: u16 section ID + u16 checksum, u32 signature, u32 save index
+    section_ids = words[:, _ID_WORD] & 0xFFFF
+    stored = words[:, _ID_WORD] >> 16
+    signatures = words[:, _SIGNATURE_WORD]
+
+    known = section_ids < len(SECTION_CHECKSUM_SIZES)
+    masks = _CHECKSUM_MASKS[np.where(known, section_ids, 0)]
+
+    total = (words[:, :_DATA_WORDS] * masks).sum(axis=1) & 0xFFFFFFFF
+    checksums = ((total >> 16) + (total & 0xFFFF)) & 0xFFFF
+
+    return known & (signatures == SECTION_SIGNATURE) & (checksums == stored)
+
+
+# str.translate table: latin-1 code point i -> text for GBA byte i
+GBA_TRANSLATION = [CHARACTER_MAP.get(b, "?") for b in range(256)]
+
+# For batch decoding every byte maps to one code point. Bytes whose text is
+# empty or longer than one character get a private-use placeholder that is
+# expanded afterwards.
+_GBA_CODEPOINTS = np.array(
+    [ord(c) if len(c) == 1 else 0xE000 + b for b, c in enumerate(GBA_TRANSLATION)],
+    dtype="<u4",
+)
+_GBA_EXPANSIONS = {
+    chr(0xE000 + b): c for b, c in enumerate(GBA_TRANSLATION) if len(c) != 1
+}
+_ROW_SEPARATOR = "\n"
+
+
+def decode_gba_string(data: bytes | memoryview) -> str:
     """Decode a GBA-encoded string from raw bytes, stopping at 0xFF."""
-    chars = []
-    for b in data:
-        if b == 0xFF:
-            break
-        chars.append(CHARACTER_MAP.get(b, "?"))
-    return "".join(chars)
+    text = bytes(data).partition(b"\xff")[0]
+    return text.decode("latin-1").translate(GBA_TRANSLATION)
+
+
+def decode_gba_strings(data: np.ndarray) -> list[str]:
+    """
+    Decode an (n, width) uint8 array of GBA-encoded strings, one per row.
+    Bytes after each row's 0xFF terminator are blanked, every byte is mapped
+    to a code point with one table lookup, and the rows are decoded as a
+    single string.
+    """
+    data = np.asarray(data, dtype=np.uint8)
+    if len(data) == 0:
+        return []
+
+    ended = np.maximum.accumulate(data == 0xFF, axis=1)
+    codepoints = _GBA_CODEPOINTS[np.where(ended, 0xFF, data)]
+
+    separator = np.full((len(data), 1), ord(_ROW_SEPARATOR), dtype="<u4")
+    text = np.hstack([codepoints, separator]).tobytes().decode("utf-32-le")
+
+    for placeholder, expansion in _GBA_EXPANSIONS.items():
+        if placeholder in text:
+            text = text.replace(placeholder, expansion)
+
+    return text.split(_ROW_SEPARATOR)[:-1]
 
 
 def calculate_nature(personal_id: int) -> str:
@@ -86,7 +181,7 @@ def get_ability_index(pid: int) -> int:
     return 1 if pid % 2 == 0 else 2
 
 
-def unpack_moves(move_bytes: bytes) -> list[int]:
+def unpack_moves(move_bytes: bytes | memoryview) -> list[int]:
     """
     Extracts moves from a packed 5 byte value
     """
@@ -94,7 +189,7 @@ def unpack_moves(move_bytes: bytes) -> list[int]:
     return [(val >> (10 * i)) & 0x3FF for i in range(4)]
 
 
-def extract_moves(move_bytes: bytes) -> list[int]:
+def extract_moves(move_bytes: bytes | memoryview) -> list[int]:
     """
     Extracts moves from an 8 byte field
     """
@@ -142,3 +237,34 @@ def xp_to_lvl(xp, growth_rate):
             high = mid - 1
 
     return low
+
+
+# EXP_TABLE[code][level] is the experience needed to reach level for the
+# growth rate GROWTH_RATES[code]. Column 0 is unused.
+EXP_TABLE = np.array(
+    [
+        [0] + [exp_required(level, rate) for level in range(1, MAX_LEVEL + 1)]
+        for rate in GROWTH_RATES
+    ],
+    dtype=np.int32,
+)
+_EXP_ROWS = EXP_TABLE.tolist()
+
+
+def level_from_xp(xp: int, growth_rate_code: int) -> int:
+    """Same result as xp_to_lvl, using the precomputed EXP_TABLE."""
+    return max(1, bisect_right(_EXP_ROWS[growth_rate_code], xp, 1) - 1)
+
+
+def levels_from_xp(xp: np.ndarray, growth_rate_codes: np.ndarray) -> np.ndarray:
+    """Vectorized level_from_xp for whole arrays of XP and growth rate codes."""
+    xp = np.asarray(xp, dtype=np.int64)
+    growth_rate_codes = np.asarray(growth_rate_codes)
+    levels = np.ones(len(xp), dtype=np.uint8)
+
+    for code in np.unique(growth_rate_codes).tolist():
+        mask = growth_rate_codes == code
+        reached = np.searchsorted(EXP_TABLE[code, 1:], xp[mask], side="right")
+        levels[mask] = np.maximum(reached, 1)
+
+    return levels
@@ -0,0 +1,59 @@
+import tempfile
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from PIL import Image
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+from sprite_store import SpriteStore
+from sprite_atlas import SpriteAtlas, build_atlas
+
+
+def write_sprite(path: Path, color: tuple) -> None:
+    """A 64x64 sprite: white background with a coloured square in the middle."""
+    sprite = Image.new("RGBA", (64, 64), (255, 255, 255, 255))
+    sprite.paste(Image.new("RGBA", (32, 32), color), (16, 16))
+    sprite.save(path)
+
+
+@pytest.fixture
+def offline_sprites(tmp_path):
+    """
+    Factory for a SpriteStore over a local sprite pack, never the network:
+    offline_sprites({species ID: colour}) -> (store, atlas). The atlas is
+    built over the pack when build is set, else it is an empty one.
+    """
+
+    def make(colors: dict[int, tuple], build: bool = False):
+        root = Path(tempfile.mkdtemp(dir=tmp_path))
+        pack = root / "pack"
+        pack.mkdir()
+        for species_id, color in colors.items():
+            write_sprite(pack / f"{species_id}.png", color)
+
+        store = SpriteStore(cache_dir=root / "cache", allow_network=False)
+        store.prefill(pack)
+
+        atlas_path, meta_path = root / "atlas.npy", root / "atlas_meta.npy"
+        if build:
+            build_atlas(max(colors) + 1, store, atlas_path, meta_path)
+        return store, SpriteAtlas(atlas_path, meta_path)
+
+    return make
+
+
+@pytest.fixture
+def offline_formatter(offline_sprites):
+    """
+    Factory for a formatter drawing every given mon's sprite from a local
+    pack: offline_formatter(mons, color=...) -> ShowdownFormatter.
+    """
+
+    def make(mons, color=(200, 40, 40, 255), export_level=50):
+        store, atlas = offline_sprites({mon.species_id: color for mon in mons})
+        formatter = ShowdownFormatter(GameDataManager(), export_level=export_level)
+        formatter.sprite_store = store
+        formatter.sprite_atlas = atlas
+        return formatter
+
+    return make
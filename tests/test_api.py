@@ -0,0 +1,314 @@
+import io
+import json
+import zipfile
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from fastapi.testclient import TestClient
+import api.main as api
+from api.workers import WorkerPool
+from save_file import SaveFile, save_digest
+from constants import SAVE_BLOCK_SIZE
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+from export_pipeline import stream_showdown
+from pokemon_extractor import PartyPokemonExtractor
+from pokemon_parser import PartyPokemonParser
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """The API on a one-thread pool with no queue, and empty caches."""
+    monkeypatch.setattr(api, "pool", WorkerPool(kind="thread", workers=1, queue_size=0))
+    api.result_cache.clear()
+    api.image_cache.clear()
+    with TestClient(api.app) as client:
+        yield client
+
+
+def upload(client, path, contents, **params):
+    return client.post(
+        path, params=params, files={"save_file": ("hijak.sav", contents)}
+    )
+
+
+def test_upload_parses_the_save(client):
+    response = upload(client, "/api/upload", SAV_PATH.read_bytes())
+
+    assert response.status_code == 200
+    assert len(response.json()["party"]) == 6
+    assert len(response.json()["box"]) == 55
+
+
+@pytest.mark.parametrize("path", ["/api/upload", "/api/export"])
+def test_corrupt_save_is_rejected(client, path):
+    # Both save blocks corrupt, so there is nothing to fall back to
+    contents = bytearray(SAV_PATH.read_bytes())
+    contents[0x100] ^= 0xFF
+    contents[SAVE_BLOCK_SIZE + 0x100] ^= 0xFF
+
+    response = upload(client, path, bytes(contents))
+    assert response.status_code == 400
+    assert "checksum" in response.json()["detail"].lower()
+
+    response = upload(client, path, b"not a save")
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/api/upload", "/api/export"])
+def test_full_pool_answers_503(client, path):
+    client.portal.call(api.pool.acquire)
+    response = upload(client, path, SAV_PATH.read_bytes())
+    client.portal.call(api.pool.release)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(api.RETRY_AFTER)
+    assert upload(client, path, SAV_PATH.read_bytes()).status_code == 200
+
+
+def test_export_streams_and_frees_its_slot(client):
+    response = upload(client, "/api/export", SAV_PATH.read_bytes(), export_level=50)
+
+    save = SaveFile(SAV_PATH.read_bytes())
+    formatter = ShowdownFormatter(GameDataManager(), 50)
+    assert response.status_code == 200
+    assert response.text == "".join(stream_showdown(save, formatter))
+    assert client.get("/api/stats").json()["worker_pool"]["pending"] == 0
+
+
+def zip_of(entries: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, contents in entries.items():
+            archive.writestr(name, contents)
+    return buf.getvalue()
+
+
+def batch(client, files: list[tuple[str, bytes]]):
+    return client.post(
+        "/api/batch-upload", files=[("files", upload) for upload in files]
+    )
+
+
+def test_batch_streams_a_line_per_save(client):
+    contents = SAV_PATH.read_bytes()
+    corpus = zip_of(
+        {
+            "saves/": b"",
+            "saves/a.sav": contents,
+            "saves/b.sav": contents,
+            "saves/notes.txt": b"hi",
+            "saves/huge.sav": bytes(api.MAX_SAVE_SIZE + 1),
+        }
+    )
+    files = [("c.sav", contents), ("corpus.zip", corpus), ("bad.zip", b"not a zip")]
+    response = batch(client, files)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = {line["file"]: line for line in map(json.loads, response.iter_lines())}
+    assert set(lines) == {
+        "c.sav",
+        "saves/a.sav",
+        "saves/b.sav",
+        "saves/notes.txt",
+        "saves/huge.sav",
+        "bad.zip",
+    }
+    for name in ("c.sav", "saves/a.sav", "saves/b.sav"):
+        assert len(lines[name]["party"]) == 6
+        assert len(lines[name]["box"]) == 55
+    assert "Invalid file type" in lines["saves/notes.txt"]["error"]
+    assert "too large" in lines["saves/huge.sav"]["error"]
+    assert "Invalid zip" in lines["bad.zip"]["error"]
+
+
+def test_batch_is_limited_in_size(client, monkeypatch):
+    monkeypatch.setattr(api, "MAX_BATCH_FILES", 2)
+    contents = SAV_PATH.read_bytes()
+
+    corpus = zip_of({f"{i}.sav": contents for i in range(3)})
+    assert batch(client, [("corpus.zip", corpus)]).status_code == 413
+
+    files = [(f"{i}.sav", contents) for i in range(3)]
+    assert batch(client, files).status_code == 413
+    assert batch(client, files[:2]).status_code == 200
+
+
+def test_batch_on_a_full_pool_answers_503(client):
+    client.portal.call(api.pool.acquire)
+    response = batch(client, [("a.sav", SAV_PATH.read_bytes())])
+    client.portal.call(api.pool.release)
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(api.RETRY_AFTER)
+
+
+def test_upload_result_is_served_by_digest(client):
+    contents = SAV_PATH.read_bytes()
+    digest = save_digest(contents)
+    first = upload(client, "/api/upload", contents, export_level=50)
+    again = upload(client, "/api/upload", contents, export_level=50)
+
+    etag = first.headers["ETag"]
+    assert again.content == first.content
+    assert again.headers["ETag"] == etag
+
+    cached = client.get(f"/api/export/{digest}", params={"export_level": 50})
+    assert cached.status_code == 200
+    assert cached.content == first.content
+    assert cached.headers["ETag"] == etag
+
+    for if_none_match in (etag, f"W/{etag}", '"other", ' + etag, "*"):
+        response = client.get(
+            f"/api/export/{digest}",
+            params={"export_level": 50},
+            headers={"If-None-Match": if_none_match},
+        )
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
+    stats = client.get("/api/stats").json()["result_cache"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 6
+    assert stats["bytes"] == len(first.content)
+
+
+def test_unknown_digest_is_never_not_modified(client):
+    digest = save_digest(SAV_PATH.read_bytes())
+    etag = api.make_etag(digest, None)
+
+    # Nothing was uploaded, so there is no representation for * to match
+    for if_none_match in (None, "*", etag):
+        headers = {"If-None-Match": if_none_match} if if_none_match else {}
+        response = client.get(f"/api/export/{digest}", headers=headers)
+        assert response.status_code == 404
+
+    # Nor is a result for other options
+    upload(client, "/api/upload", SAV_PATH.read_bytes())
+    response = client.get(
+        f"/api/export/{digest}",
+        params={"export_level": 50},
+        headers={"If-None-Match": "*"},
+    )
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def party_sprites(offline_sprites, monkeypatch):
+    """Draw team images from a local pack with a sprite for every party mon."""
+    save = SaveFile(SAV_PATH.read_bytes())
+    records = PartyPokemonExtractor(save.active_block).iter_party()
+    party = list(PartyPokemonParser().iter_parse(records))
+
+    def use(colors: dict[int, tuple]):
+        store, atlas = offline_sprites(colors)
+        monkeypatch.setattr(ShowdownFormatter, "sprite_store", store)
+        monkeypatch.setattr(ShowdownFormatter, "sprite_atlas", atlas)
+        ShowdownFormatter.tile_cache.clear()
+
+    use({mon.species_id: (200, 40, 40, 255) for mon in party})
+    yield party, use
+    ShowdownFormatter.tile_cache.clear()
+
+
+def test_team_image_is_cached_and_served_by_digest(client, party_sprites):
+    contents = SAV_PATH.read_bytes()
+    digest = save_digest(contents)
+    params = {"export_level": 50, "encoding": "webp"}
+
+    first = upload(client, "/api/team-image", contents, **params)
+    assert first.status_code == 200
+    assert first.headers["content-type"] == "image/webp"
+    assert first.headers["Cache-Control"] == api.IMAGE_CACHE_CONTROL
+    etag = first.headers["ETag"]
+    assert etag == api.make_etag(digest, 50, "webp")
+
+    again = upload(client, "/api/team-image", contents, **params)
+    assert again.content == first.content
+    assert client.get("/api/stats").json()["image_cache"]["hits"] == 1
+
+    cached = client.get(f"/api/team-image/{digest}", params=params)
+    assert cached.content == first.content
+    assert cached.headers["ETag"] == etag
+
+    for if_none_match in (etag, "*"):
+        response = client.get(
+            f"/api/team-image/{digest}",
+            params=params,
+            headers={"If-None-Match": if_none_match},
+        )
+        assert response.status_code == 304
+        assert response.headers["Cache-Control"] == api.IMAGE_CACHE_CONTROL
+
+    # Other options were never rendered
+    response = client.get(f"/api/team-image/{digest}", headers={"If-None-Match": "*"})
+    assert response.status_code == 404
+
+
+def test_team_image_with_missing_sprites_is_not_cached(client, party_sprites):
+    party, use = party_sprites
+    use({party[0].species_id: (200, 40, 40, 255)})
+    contents = SAV_PATH.read_bytes()
+
+    response = upload(client, "/api/team-image", contents)
+    assert response.status_code == 200
+    assert "ETag" not in response.headers
+    assert client.get("/api/stats").json()["image_cache"]["size"] == 0
+
+    response = client.get(f"/api/team-image/{save_digest(contents)}")
+    assert response.status_code == 404
+
+
+def test_team_image_rejects_bad_requests(client, party_sprites):
+    contents = SAV_PATH.read_bytes()
+
+    response = upload(client, "/api/team-image", contents, encoding="gif")
+    assert response.status_code == 400
+    response = upload(client, "/api/team-image", b"not a save")
+    assert response.status_code == 400
+
+    client.portal.call(api.pool.acquire)
+    response = upload(client, "/api/team-image", contents)
+    client.portal.call(api.pool.release)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(api.RETRY_AFTER)
+
+
+def test_upload_can_stream_ndjson(client):
+    contents = SAV_PATH.read_bytes()
+    response = upload(client, "/api/upload", contents, stream=True)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["ETag"] == api.make_etag(
+        save_digest(contents), None, "ndjson"
+    )
+    records = [json.loads(line) for line in response.iter_lines()]
+    party = [r for r in records if r["source"] == "party"]
+    box = [r for r in records if r["source"] == "box"]
+    assert [r["slot"] for r in party] == list(range(1, 7))
+    assert all(1 <= r["box"] and 1 <= r["slot"] <= 30 for r in box)
+
+    # Same blocks as the buffered response, and the slot is given back
+    result = upload(client, "/api/upload", contents).json()
+    assert [r["showdown"] for r in party] == result["party"]
+    assert [r["showdown"] for r in box] == result["box"]
+    assert client.get("/api/stats").json()["worker_pool"]["pending"] == 0
+
+
+def test_streamed_upload_is_checked_and_gated(client):
+    contents = bytearray(SAV_PATH.read_bytes())
+    contents[0x100] ^= 0xFF
+    contents[SAVE_BLOCK_SIZE + 0x100] ^= 0xFF
+    response = upload(client, "/api/upload", bytes(contents), stream=True)
+    assert response.status_code == 400
+
+    client.portal.call(api.pool.acquire)
+    response = upload(client, "/api/upload", SAV_PATH.read_bytes(), stream=True)
+    client.portal.call(api.pool.release)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(api.RETRY_AFTER)
@@ -0,0 +1,93 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import pytest
+import add_src  # noqa
+from pathlib import Path
+import numpy as np
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor
+from box_renderer import (
+    BOX_PADDING,
+    HEADER_HEIGHT,
+    BoxImageRenderer,
+    parse_storage_slots,
+)
+from utils import split_into_chunks
+from constants import BOX_COUNT, BOXMON_SIZE
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+
+
+@pytest.fixture
+def extractor():
+    save = SaveFile(SAV_PATH.read_bytes())
+    return BoxPokemonExtractor(save.active_block, save.expanded_block)
+
+
+@pytest.fixture
+def formatter(offline_formatter, extractor):
+    formatter = offline_formatter(
+        parse_storage_slots(extractor).values(), color=(40, 200, 40, 255)
+    )
+    BoxImageRenderer.tile_cache.clear()
+    return formatter
+
+
+def test_storage_slots_keep_their_position(extractor):
+    chunks = split_into_chunks(extractor.storage_bytes, BOXMON_SIZE, skip_empty=False)
+    occupied = [slot for slot, chunk in enumerate(chunks) if chunk[0] != 0]
+
+    assert list(parse_storage_slots(extractor)) == occupied
+
+
+def test_render_boxes_places_each_slot(formatter, extractor):
+    slots = parse_storage_slots(extractor)
+    renderer = BoxImageRenderer(formatter, workers=4)
+
+    images = renderer.render_boxes(slots)
+    assert len(images) == BOX_COUNT
+    assert all(image.size == renderer.box_size() for image in images)
+
+    # Box 1, slot 1 sits right under the header
+    first = slots[0]
+    tile = renderer.slot_tile(first)
+    top_left = (BOX_PADDING, BOX_PADDING + HEADER_HEIGHT)
+    box = top_left + (top_left[0] + tile.width, top_left[1] + tile.height)
+    assert np.array_equal(np.array(images[0].crop(box)), np.array(tile))
+
+
+def test_sheet_is_the_same_for_any_worker_count(formatter, extractor):
+    slots = parse_storage_slots(extractor)
+
+    serial = BoxImageRenderer(formatter, workers=1).render_sheet(slots)
+    BoxImageRenderer.tile_cache.clear()
+    parallel = BoxImageRenderer(formatter, workers=4).render_sheet(slots)
+
+    assert serial.tobytes() == parallel.tobytes()
+
+
+def test_concurrent_renders_load_each_sprite_once(formatter, extractor):
+    slots = parse_storage_slots(extractor)
+    serial = BoxImageRenderer(formatter, workers=1).render_sheet(slots)
+
+    BoxImageRenderer.tile_cache.clear()
+    store = formatter.sprite_store
+    store.clear()
+    load = store._load
+
+    def slow_load(*args):
+        time.sleep(0.01)
+        return load(*args)
+
+    def render(_):
+        return BoxImageRenderer(formatter, workers=4).render_sheet(slots)
+
+    # Two renders at once, each on its own tile pool, as API threads would
+    with patch.object(store, "_load", side_effect=slow_load):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            sheets = list(pool.map(render, range(2)))
+
+    assert all(sheet.tobytes() == serial.tobytes() for sheet in sheets)
+    species = {mon.species_id for mon in slots.values()}
+    assert store.stats["disk_hits"] == len(species)
@@ -0,0 +1,56 @@
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor
+from pokemon_parser import BoxPokemonParser
+from bulk_decoder import BoxStorageDecoder, layout_dtype
+from constants import BOXMON_OFFSETS, BOXMON_SIZE
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+
+
+@pytest.fixture
+def extractor():
+    save = SaveFile(SAV_PATH.read_bytes())
+    return BoxPokemonExtractor(save.active_block, save.expanded_block)
+
+
+def test_layout_dtype_matches_offsets():
+    dtype = layout_dtype(BOXMON_OFFSETS, BOXMON_SIZE)
+
+    assert dtype.itemsize == BOXMON_SIZE
+    for name, (start, stop) in BOXMON_OFFSETS.items():
+        field_dtype, offset = dtype.fields[name]
+        assert offset == start
+        assert field_dtype.itemsize == stop - start
+
+
+def test_parse_storage_matches_per_mon_parse(extractor):
+    parser = BoxPokemonParser()
+    expected = [parser.parse(mon) for mon in extractor.pokemon_in_storage]
+
+    assert expected
+    assert parser.parse_storage(extractor.storage_bytes) == expected
+
+
+def test_decode_skips_empty_slots(extractor):
+    mon = bytes(extractor.pokemon_in_storage[0])
+    storage = bytes(BOXMON_SIZE) + mon + bytes(BOXMON_SIZE) + mon
+
+    columns = BoxStorageDecoder().decode(storage)
+
+    assert columns["slot"].tolist() == [1, 3]
+    assert len(columns["moves"]) == 2
+
+
+def test_decode_rejects_partial_records():
+    with pytest.raises(ValueError):
+        BoxStorageDecoder().decode(bytes(BOXMON_SIZE + 1))
+
+
+def test_nicknames_match_parse(extractor):
+    parser = BoxPokemonParser()
+    expected = [parser.parse(mon).nickname for mon in extractor.pokemon_in_storage]
+
+    assert BoxStorageDecoder().nicknames(extractor.storage_bytes) == expected
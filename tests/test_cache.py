@@ -0,0 +1,74 @@
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from cache import LRUCache
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor
+from pokemon_parser import BoxPokemonParser
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+
+    cache.put("c", 3)
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.stats == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 1,
+        "misses": 1,
+        "evictions": 1,
+        "hit_ratio": 0.5,
+    }
+
+
+def test_lru_rejects_empty_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_lru_evicts_to_byte_budget():
+    cache = LRUCache(maxsize=10, max_bytes=10, sizeof=len)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.put("a", b"123456")  # resizing counts the new size only
+    assert cache.bytes == 10
+
+    cache.put("c", b"12")
+    assert "b" not in cache
+    assert cache.stats["bytes"] == 8
+    assert cache.stats["max_bytes"] == 10
+
+    # Too big to ever fit, so it is evicted straight away
+    cache.put("d", b"x" * 11)
+    assert len(cache) == 0
+    assert cache.bytes == 0
+
+
+def test_repeat_format_hits_cache():
+    save = SaveFile(SAV_PATH.read_bytes())
+    extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    box = BoxPokemonParser().parse_storage(extractor.storage_bytes)
+
+    ShowdownFormatter.format_cache.clear()
+    formatter = ShowdownFormatter(GameDataManager(), export_level=50)
+
+    first = [formatter.format(mon) for mon in box]
+    assert formatter.format_cache.hits == 0
+
+    second = [ShowdownFormatter(GameDataManager(), 50).format(mon) for mon in box]
+    assert second == first
+    assert formatter.format_cache.hits == len(box)
+    assert first == [formatter._format(mon) for mon in box]
+
+    other_level = ShowdownFormatter(GameDataManager()).format(box[0])
+    assert other_level == ShowdownFormatter(GameDataManager())._format(box[0])
@@ -0,0 +1,48 @@
+import add_src  # noqa
+import marshal
+from data_bundle import DataBundle, build_bundle, is_stale, load_json, DATA_DIR
+from data_manager import SpeciesDataProvider, GrowthRateProvider
+
+
+def test_bundle_sections_match_json(tmp_path):
+    path = tmp_path / "game_data.bundle"
+    build_bundle(path)
+
+    assert path.exists()
+    assert not is_stale(path)
+
+    bundle = DataBundle.open(path)
+    for json_path in DATA_DIR.glob("*.json"):
+        assert bundle.load(json_path.name) == load_json(json_path.name)
+
+
+def test_truncated_bundle_falls_back_to_json(tmp_path):
+    path = tmp_path / "game_data.bundle"
+    full = build_bundle(path)
+    path.write_bytes(full[: len(full) // 2])
+
+    bundle = DataBundle.open(path)
+    for json_path in DATA_DIR.glob("*.json"):
+        assert bundle.load(json_path.name) == load_json(json_path.name)
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_compacted_sections_survive_marshal():
+    abilities = load_json("abilities.json")
+    assert marshal.loads(marshal.dumps(abilities)) == abilities
+    assert all(len(entry) == 3 for entry in abilities.values())
+
+
+def test_missing_bundle_is_stale(tmp_path):
+    assert is_stale(tmp_path / "missing.bundle")
+
+
+def test_providers_load_lazily():
+    species = SpeciesDataProvider()
+    growth_rates = GrowthRateProvider()
+    assert species._loaded is None
+    assert growth_rates._loaded is None
+
+    assert species.get_name(1) == "Bulbasaur"
+    assert species._loaded is not None
+    assert growth_rates._loaded is None
@@ -0,0 +1,48 @@
+import pytest
+import add_src  # noqa
+import numpy as np
+from utils import exp_required, xp_to_lvl, level_from_xp, levels_from_xp, EXP_TABLE
+from constants import GROWTH_RATES, GROWTH_RATE_CODES, MAX_LEVEL
+from data_manager import GameDataManager
+
+
+def boundary_xp(growth_rate: str) -> list[int]:
+    """Every XP value on either side of every level threshold."""
+    values = {0, 2**32 - 1}
+    for level in range(1, MAX_LEVEL + 1):
+        needed = exp_required(level, growth_rate)
+        values.update(xp for xp in (needed - 1, needed, needed + 1) if xp >= 0)
+    return sorted(values)
+
+
+@pytest.mark.parametrize("growth_rate", GROWTH_RATES)
+def test_level_lookup_matches_xp_to_lvl(growth_rate):
+    code = GROWTH_RATE_CODES[growth_rate]
+    xp = boundary_xp(growth_rate)
+    expected = [xp_to_lvl(value, growth_rate) for value in xp]
+
+    assert [level_from_xp(value, code) for value in xp] == expected
+    assert levels_from_xp(xp, [code] * len(xp)).tolist() == expected
+
+
+def test_table_shape():
+    assert EXP_TABLE.shape == (len(GROWTH_RATES), MAX_LEVEL + 1)
+
+
+def test_mixed_growth_rates_in_one_batch():
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, len(GROWTH_RATES), 500)
+    xp = rng.integers(0, 1_700_000, 500)
+
+    expected = [xp_to_lvl(x, GROWTH_RATES[c]) for x, c in zip(xp, codes)]
+    assert levels_from_xp(xp, codes).tolist() == expected
+
+
+def test_species_growth_rate_codes_match_names():
+    gdm = GameDataManager()
+    species_ids = np.arange(0, 1400)
+
+    expected = [GROWTH_RATE_CODES[gdm.get_growth_rate(s)] for s in species_ids]
+
+    assert [gdm.get_growth_rate_code(s) for s in species_ids] == expected
+    assert gdm.get_growth_rate_codes(species_ids).tolist() == expected
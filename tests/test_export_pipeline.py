@@ -0,0 +1,94 @@
+import json
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor, PartyPokemonExtractor
+from pokemon_parser import BoxPokemonParser, PartyPokemonParser
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+from export_pipeline import stream_ndjson, stream_showdown
+from constants import FRLG_BOX_SECTIONS, MONS_PER_BOX
+
+SAV_DIR = Path(__file__).parent.parent / "sav"
+SAV_PATHS = sorted(SAV_DIR.glob("*.sav"))
+
+
+def full_export(save: SaveFile, formatter: ShowdownFormatter, party: bool, box: bool):
+    """The export as built before streaming: whole lists joined at the end."""
+    party_extractor = PartyPokemonExtractor(save.active_block)
+    box_extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    party_mons = [
+        formatter.format(PartyPokemonParser().parse(p))
+        for p in party_extractor.pokemon_in_party
+    ]
+    box_mons = [
+        formatter.format(mon)
+        for mon in BoxPokemonParser().parse_storage(box_extractor.storage_bytes)
+    ]
+
+    export_text = ""
+    if party:
+        export_text += "\n".join(party_mons) + "\n\n"
+    if box:
+        export_text += "\n".join(box_mons) + "\n\n"
+    return export_text.strip()
+
+
+@pytest.mark.parametrize("sav_path", SAV_PATHS, ids=str)
+def test_iter_storage_matches_pokemon_in_storage(sav_path):
+    save = SaveFile(sav_path.read_bytes())
+    extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+
+    streamed = [bytes(record) for record in extractor.iter_storage()]
+    assert streamed == [bytes(record) for record in extractor.pokemon_in_storage]
+
+
+@pytest.mark.parametrize("sav_path", SAV_PATHS, ids=str)
+@pytest.mark.parametrize("party,box", [(True, True), (True, False), (False, True)])
+def test_stream_matches_full_export(sav_path, party, box):
+    save = SaveFile(sav_path.read_bytes())
+    formatter = ShowdownFormatter(GameDataManager(), export_level=50)
+
+    streamed = "".join(stream_showdown(save, formatter, party, box))
+    assert streamed == full_export(save, formatter, party, box)
+
+
+def test_stream_yields_before_storage_is_read():
+    save = SaveFile((SAV_DIR / "hijak.sav").read_bytes())
+    formatter = ShowdownFormatter(GameDataManager())
+
+    pieces = stream_showdown(save, formatter, party=False, box=True)
+    next(pieces)
+
+    # Sections are built lazily, so only the first box section has been read
+    first_index = save.active_block.section_map[FRLG_BOX_SECTIONS[0]]
+    assert list(save.active_block._sections) == [first_index]
+    assert not save.expanded_block._sections
+
+
+@pytest.mark.parametrize("sav_path", SAV_PATHS, ids=str)
+def test_ndjson_records_match_upload(sav_path):
+    save = SaveFile(sav_path.read_bytes())
+    formatter = ShowdownFormatter(GameDataManager())
+    chunks = list(stream_ndjson(save, formatter))
+    records = [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+    party = [r for r in records if r["source"] == "party"]
+    box = [r for r in records if r["source"] == "box"]
+    assert party + box == records
+    assert [r["slot"] for r in party] == list(range(1, len(party) + 1))
+
+    assert "\n".join(r["showdown"] for r in party).strip() == full_export(
+        save, formatter, party=True, box=False
+    )
+    assert "\n".join(r["showdown"] for r in box).strip() == full_export(
+        save, formatter, party=False, box=True
+    )
+
+    extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    slots = [slot for slot, _ in extractor.iter_storage_slots()]
+    assert [(r["box"] - 1) * MONS_PER_BOX + r["slot"] - 1 for r in box] == slots
+
+    # One chunk for the party, then one per occupied box
+    assert len(chunks) == bool(party) + len({r["box"] for r in box})
@@ -0,0 +1,35 @@
+import add_src  # noqa
+import numpy as np
+from utils import decode_gba_string, decode_gba_strings
+from constants import CHARACTER_MAP
+
+
+def reference_decode(data: bytes) -> str:
+    chars = []
+    for b in data:
+        if b == 0xFF:
+            break
+        chars.append(CHARACTER_MAP.get(b, "?"))
+    return "".join(chars)
+
+
+def test_every_byte_value():
+    for b in range(256):
+        assert decode_gba_string(bytes([b, 0xBB])) == reference_decode(bytes([b, 0xBB]))
+
+
+def test_terminator():
+    assert decode_gba_string(bytes([0xC2, 0xD9, 0xFF, 0xBB])) == "He"
+    assert decode_gba_string(bytes([0xFF, 0xBB])) == ""
+
+
+def test_batch_matches_single():
+    rng = np.random.default_rng(0)
+    names = rng.integers(0, 256, (2000, 10), dtype=np.uint8)
+    names[::3, 4] = 0xFF
+    names[::7, 0] = 0xFF
+
+    expected = [reference_decode(row.tobytes()) for row in names]
+
+    assert decode_gba_strings(names) == expected
+    assert decode_gba_strings(np.zeros((0, 10), dtype=np.uint8)) == []
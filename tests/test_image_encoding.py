@@ -0,0 +1,38 @@
+import pytest
+import add_src  # noqa
+import numpy as np
+from PIL import Image
+from image_encoding import ENCODINGS, ImageEncoding, get_encoding, to_palette
+
+
+def flat_image() -> Image.Image:
+    """An opaque image with a few flat colours, like a team image."""
+    pixels = np.full((40, 60, 4), (18, 18, 18, 255), dtype=np.uint8)
+    pixels[5:20, 5:30] = (200, 40, 40, 255)
+    pixels[25:35, 10:50] = (170, 170, 170, 255)
+    return Image.fromarray(pixels, "RGBA")
+
+
+@pytest.mark.parametrize("name", ["png", "png-fast", "png-palette", "webp"])
+def test_encodings_are_lossless_for_flat_images(name):
+    img = flat_image()
+    decoded = Image.open(get_encoding(name).encode(img)).convert("RGBA")
+
+    assert np.array_equal(np.array(decoded), np.array(img))
+
+
+def test_palette_is_exact_up_to_256_colours():
+    img = flat_image()
+    paletted = to_palette(img)
+
+    assert paletted.mode == "P"
+    assert np.array_equal(np.array(paletted.convert("RGBA")), np.array(img))
+
+
+def test_get_encoding():
+    custom = ImageEncoding(compress_level=0)
+
+    assert get_encoding(custom) is custom
+    assert get_encoding("webp") is ENCODINGS["webp"]
+    with pytest.raises(ValueError):
+        get_encoding("gif")
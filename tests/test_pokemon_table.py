@@ -0,0 +1,49 @@
+import pytest
+import add_src  # noqa
+import numpy as np
+from pathlib import Path
+from save_file import SaveFile
+from pokemon_extractor import PartyPokemonExtractor, BoxPokemonExtractor
+from pokemon_parser import PartyPokemonParser, BoxPokemonParser
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+
+
+@pytest.fixture
+def save():
+    return SaveFile(SAV_PATH.read_bytes())
+
+
+def test_party_table_rows_match_parse(save):
+    extractor = PartyPokemonExtractor(save.active_block)
+    parser = PartyPokemonParser()
+    expected = [parser.parse(mon) for mon in extractor.pokemon_in_party]
+
+    table = parser.parse_table(extractor.party_bytes)
+
+    assert len(table) == len(expected)
+    assert list(table) == expected
+    assert [table[i] for i in range(len(table))] == expected
+
+
+def test_box_table_columns(save):
+    extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    parser = BoxPokemonParser()
+    expected = [parser.parse(mon) for mon in extractor.pokemon_in_storage]
+
+    table = parser.parse_table(extractor.storage_bytes)
+
+    assert table.move_ids.shape == (len(expected), 4)
+    assert table.evs.shape == table.ivs.shape == (len(expected), 6)
+    assert table.level.tolist() == [mon.level for mon in expected]
+    assert table.species_id.tolist() == [mon.species_id for mon in expected]
+
+
+def test_take_filters_rows(save):
+    extractor = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    table = BoxPokemonParser().parse_table(extractor.storage_bytes)
+
+    high = table.take(table.level >= 30)
+
+    assert len(high) == int(np.count_nonzero(table.level >= 30))
+    assert all(mon.level >= 30 for mon in high)
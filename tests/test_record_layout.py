@@ -0,0 +1,39 @@
+import pytest
+import add_src  # noqa
+import struct
+from record_layout import RecordLayout, BOX_LAYOUT, PARTY_LAYOUT
+from constants import BOXMON_SIZE, POKEMON_SIZE
+
+
+def test_compiled_layouts_cover_whole_record():
+    assert BOX_LAYOUT.struct.size == BOXMON_SIZE
+    assert PARTY_LAYOUT.struct.size == POKEMON_SIZE
+
+
+def test_new_layout_from_offset_table():
+    offsets = {"a": (0x0, 0x2), "b": (0x4, 0x7), "c": (0x8, 0x10)}
+    layout = RecordLayout(offsets, 0x12, formats={"c": "2I"})
+    record = struct.pack("<H2x3BxII2x", 0x1234, 1, 2, 3, 7, 9)
+
+    assert layout.unpack(record) == {"a": 0x1234, "b": (1, 2, 3), "c": (7, 9)}
+    assert layout.unpack(b"\0" * 4 + record, offset=4)["a"] == 0x1234
+
+
+def test_derived_fields():
+    layout = RecordLayout(
+        {"ivs": (0x0, 0x4)}, 0x4, derived={"low": ("ivs", lambda v: v & 0x1F)}
+    )
+    assert layout.unpack(struct.pack("<I", 0xFFFF_FFE5))["low"] == 5
+
+
+@pytest.mark.parametrize(
+    "offsets,formats",
+    [
+        ({"a": (0x0, 0x4), "b": (0x2, 0x6)}, None),  # overlap
+        ({"a": (0x0, 0x4)}, {"a": "H"}),  # format width mismatch
+        ({"a": (0x0, 0x10)}, None),  # longer than the record
+    ],
+)
+def test_invalid_layouts_are_rejected(offsets, formats):
+    with pytest.raises(ValueError):
+        RecordLayout(offsets, 0x8, formats=formats)
@@ -0,0 +1,110 @@
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from save_file import SaveFile, save_digest
+from pokemon_extractor import PartyPokemonExtractor, BoxPokemonExtractor
+from constants import SAVE_FILE_SIZE, RTC_SAVE_SIZE, SAVE_BLOCK_SIZE
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+
+
+@pytest.fixture
+def raw():
+    return SAV_PATH.read_bytes()
+
+
+def test_sections_are_views_of_upload(raw):
+    """Sections and mon records should share the uploaded buffer, not copy it."""
+    save = SaveFile(raw)
+
+    assert isinstance(save.raw, memoryview)
+    assert save.raw.obj is raw
+
+    section = save.active_block.get_section(1)
+    assert isinstance(section.data, memoryview)
+    assert section.data.obj is raw
+
+    for mon in PartyPokemonExtractor(save.active_block).pokemon_in_party:
+        assert isinstance(mon, memoryview)
+        assert mon.obj is raw
+
+    box = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    assert all(isinstance(mon, memoryview) for mon in box.pokemon_in_storage)
+
+
+def test_rtc_footer_is_trimmed_without_copy(raw):
+    padded = raw[:SAVE_FILE_SIZE] + bytes(RTC_SAVE_SIZE - SAVE_FILE_SIZE)
+    save = SaveFile(padded)
+
+    assert len(save.raw) == SAVE_FILE_SIZE
+    assert save.raw.obj is padded
+
+
+def test_unexpected_size_is_rejected():
+    with pytest.raises(ValueError):
+        SaveFile(bytes(100))
+
+
+def test_sections_are_built_on_demand(raw):
+    save = SaveFile(raw)
+    inactive = save.block_b if save.active_block is save.block_a else save.block_a
+
+    assert save.active_block._sections == {}
+    assert inactive._sections == {}
+
+    section = save.active_block.get_section(1)
+    assert section.section_id == 1
+    assert save.active_block.get_section(1) is section
+    assert list(save.active_block._sections.values()) == [section]
+
+    BoxPokemonExtractor(save.active_block, save.expanded_block).pokemon_in_storage
+    assert inactive._sections == {}
+
+
+def test_save_index_matches_section_footer(raw):
+    save = SaveFile(raw)
+    for block in (save.block_a, save.block_b):
+        assert block.get_save_index() == block.sections[13].save_index
+
+
+def test_checksums_pass_for_fixture(raw):
+    save = SaveFile(raw, verify_checksums=True)
+    assert save.is_block_valid(save.block_a)
+    assert save.is_block_valid(save.block_b)
+
+
+def test_corrupt_active_block_falls_back(raw):
+    original = SaveFile(raw)
+    active_is_a = original.active_block is original.block_a
+
+    corrupt = bytearray(raw)
+    corrupt[(0 if active_is_a else SAVE_BLOCK_SIZE) + 0x100] ^= 0xFF
+
+    save = SaveFile(bytes(corrupt), verify_checksums=True)
+    newest, older = (
+        (save.block_a, save.block_b) if active_is_a else (save.block_b, save.block_a)
+    )
+    assert not save.is_block_valid(newest)
+    assert save.active_block is older
+
+
+def test_both_blocks_corrupt_is_rejected(raw):
+    corrupt = bytearray(raw)
+    corrupt[0x100] ^= 0xFF
+    corrupt[SAVE_BLOCK_SIZE + 0x100] ^= 0xFF
+
+    SaveFile(bytes(corrupt))  # still parses without verification
+    with pytest.raises(ValueError):
+        SaveFile(bytes(corrupt), verify_checksums=True)
+
+
+def test_digest_ignores_rtc_footer(raw):
+    assert len(raw) == RTC_SAVE_SIZE
+    assert save_digest(raw) == save_digest(raw[:SAVE_FILE_SIZE])
+
+    changed = bytearray(raw)
+    changed[0x100] ^= 0xFF
+    assert save_digest(bytes(changed)) != save_digest(raw)
+
+    with pytest.raises(ValueError):
+        save_digest(raw[:-1])
@@ -0,0 +1,28 @@
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor, PartyPokemonExtractor
+from pokemon_parser import BoxPokemonParser, PartyPokemonParser
+from showdown_formatter import ShowdownFormatter
+from data_manager import GameDataManager
+
+SAV_DIR = Path(__file__).parent.parent / "sav"
+
+
+def tables(sav_path: Path):
+    save = SaveFile(sav_path.read_bytes())
+    party = PartyPokemonExtractor(save.active_block).party_bytes
+    box = BoxPokemonExtractor(save.active_block, save.expanded_block).storage_bytes
+    return PartyPokemonParser().parse_table(party), BoxPokemonParser().parse_table(box)
+
+
+@pytest.mark.parametrize("sav_path", sorted(SAV_DIR.glob("*.sav")), ids=str)
+@pytest.mark.parametrize("export_level", [None, 50])
+def test_export_table_matches_per_mon_format(sav_path, export_level):
+    formatter = ShowdownFormatter(GameDataManager(), export_level)
+
+    for table in tables(sav_path):
+        expected = [formatter.format(mon) for mon in table]
+        assert formatter.format_table(table) == expected
+        assert formatter.export_table(table) == "\n".join(expected)
@@ -0,0 +1,29 @@
+import add_src  # noqa
+import numpy as np
+from data_manager import GameDataManager
+
+
+def test_records_match_provider_lookups():
+    gdm = GameDataManager()
+    table = gdm.species_table
+
+    for species_id in range(len(table) + 5):
+        record = gdm.get_species_record(species_id)
+        name = gdm.get_species_name(species_id)
+
+        assert record.name == name
+        assert record.growth_rate_code == gdm.get_growth_rate_code(species_id)
+        for ability_id in (1, 2, 3):
+            for has_ha in (False, True):
+                assert record.ability_name(
+                    ability_id, has_ha
+                ) == gdm.get_ability_name(ability_id, name, has_ha)
+
+
+def test_gather_names():
+    gdm = GameDataManager()
+    species_ids = np.array([1, 25, 0, 60000, 3])
+
+    names = gdm.species_table.gather_names(species_ids)
+
+    assert names.tolist() == [gdm.get_species_name(s) for s in species_ids.tolist()]
@@ -0,0 +1,49 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import add_src  # noqa
+import numpy as np
+from sprite_store import prepare_sprite
+from sprite_atlas import SpriteAtlas, build_atlas
+
+
+def test_atlas_matches_prepared_sprites(tmp_path, offline_sprites):
+    store, _ = offline_sprites({1: (200, 40, 40, 255), 3: (10, 10, 60, 255)})
+
+    atlas_path = tmp_path / "atlas.npy"
+    meta_path = tmp_path / "atlas_meta.npy"
+    assert build_atlas(4, store, atlas_path, meta_path) == 2
+
+    atlas = SpriteAtlas(atlas_path, meta_path)
+    for species_id in (1, 3):
+        sprite, color = atlas.get(species_id)
+        expected, expected_color = prepare_sprite(store.get(species_id))
+
+        assert np.array_equal(np.array(sprite), np.array(expected))
+        assert color == expected_color
+
+    assert atlas.get(0) is None
+    assert atlas.get(2) is None
+    assert atlas.get(4) is None
+
+
+def test_missing_atlas_is_unavailable(tmp_path):
+    atlas = SpriteAtlas(tmp_path / "atlas.npy", tmp_path / "atlas_meta.npy")
+
+    assert not atlas.available
+    assert atlas.get(1) is None
+
+
+def test_concurrent_first_use_waits_for_load(offline_sprites):
+    _, atlas = offline_sprites({1: (200, 40, 40, 255)}, build=True)
+    load = np.load
+
+    def slow_load(*args, **kwargs):
+        time.sleep(0.05)
+        return load(*args, **kwargs)
+
+    with patch("sprite_atlas.np.load", side_effect=slow_load):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: atlas.get(1), range(8)))
+
+    assert all(result is not None for result in results)
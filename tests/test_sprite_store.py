@@ -0,0 +1,95 @@
+import time
+import pytest
+import add_src  # noqa
+from io import BytesIO
+from unittest.mock import Mock, patch
+import numpy as np
+from PIL import Image
+from sprite_store import FAILURE_TTL, SpriteStore, remove_background
+
+URL = "https://example.com/front/25.png"
+
+
+def png_bytes() -> bytes:
+    """A 4x4 sprite: white background with one red pixel in the middle."""
+    sprite = Image.new("RGBA", (4, 4), (255, 255, 255, 255))
+    sprite.putpixel((1, 1), (255, 0, 0, 255))
+    buf = BytesIO()
+    sprite.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def response():
+    return Mock(content=png_bytes(), raise_for_status=Mock())
+
+
+def test_download_is_cached_on_disk_and_in_memory(tmp_path, response):
+    store = SpriteStore(cache_dir=tmp_path)
+
+    with patch("sprite_store.requests.get", return_value=response) as get:
+        sprite = store.get(25, URL)
+        assert store.get(25, URL) is sprite
+        get.assert_called_once()
+
+    assert (tmp_path / "25.png").read_bytes() == response.content
+    assert sprite.getpixel((0, 0)) == (0, 0, 0, 0)
+    assert sprite.getpixel((1, 1)) == (255, 0, 0, 255)
+
+    # A fresh store (e.g. a new process) reads the disk cache instead
+    fresh = SpriteStore(cache_dir=tmp_path, allow_network=False)
+    assert fresh.get(25, URL).tobytes() == sprite.tobytes()
+    assert fresh.stats["disk_hits"] == 1
+    assert fresh.stats["downloads"] == 0
+
+
+def test_prefilled_store_works_offline(tmp_path):
+    pack = tmp_path / "pack"
+    pack.mkdir()
+    (pack / "25.png").write_bytes(png_bytes())
+    (pack / "readme.png").write_bytes(b"")
+
+    store = SpriteStore(cache_dir=tmp_path / "cache", allow_network=False)
+    assert store.prefill(pack) == 1
+
+    with patch("sprite_store.requests.get") as get:
+        assert store.get(25, URL) is not None
+        assert store.get(25, URL) is not None
+        get.assert_not_called()
+
+    assert store.stats["local_hit_ratio"] == 1.0
+
+
+def test_missing_sprite_returns_none_offline(tmp_path):
+    store = SpriteStore(cache_dir=tmp_path, allow_network=False)
+
+    assert store.get(25, URL) is None
+    assert store.stats["failures"] == 1
+
+
+def test_failed_load_is_not_retried_until_ttl(tmp_path, response):
+    store = SpriteStore(cache_dir=tmp_path)
+
+    with patch("sprite_store.requests.get", side_effect=ConnectionError) as get:
+        assert store.get(25, URL, quiet=True) is None
+        assert store.get(25, URL, quiet=True) is None
+        get.assert_called_once()
+    assert store.stats["failures"] == 1
+    assert store.stats["skipped"] == 1
+
+    later = time.monotonic() + FAILURE_TTL + 1
+    with patch("sprite_store.time.monotonic", return_value=later):
+        with patch("sprite_store.requests.get", return_value=response):
+            assert store.get(25, URL) is not None
+
+
+def test_background_tie_goes_to_first_border_pixel():
+    # Left column is blue, right column red: each is half of the border
+    pixels = np.zeros((3, 2, 4), dtype=np.uint8)
+    pixels[:, 0] = (0, 0, 255, 255)
+    pixels[:, 1] = (255, 0, 0, 128)
+
+    result = np.array(remove_background(Image.fromarray(pixels, "RGBA")))
+
+    assert (result[:, 0] == 0).all()
+    assert (result[:, 1] == (255, 0, 0, 128)).all()
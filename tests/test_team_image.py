@@ -0,0 +1,55 @@
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from save_file import SaveFile
+from pokemon_extractor import BoxPokemonExtractor, PartyPokemonExtractor
+from pokemon_parser import BoxPokemonParser, PartyPokemonParser
+from sprite_atlas import SpriteAtlas
+from sprite_store import SpriteStore
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+
+
+@pytest.fixture
+def mons():
+    save = SaveFile(SAV_PATH.read_bytes())
+    party = PartyPokemonExtractor(save.active_block).iter_party()
+    storage = BoxPokemonExtractor(save.active_block, save.expanded_block)
+    return list(PartyPokemonParser().iter_parse(party)), list(
+        BoxPokemonParser().iter_parse(storage.iter_storage())
+    )
+
+
+@pytest.fixture
+def formatter(offline_formatter, mons):
+    formatter = offline_formatter(mons[0] + mons[1])
+    formatter.tile_cache.clear()
+    return formatter
+
+
+def test_only_changed_cards_are_rerendered(formatter, mons):
+    party, box = mons
+
+    first = formatter.format_image(party)
+    assert formatter.tile_cache.misses == len(party)
+
+    assert formatter.format_image(party).tobytes() == first.tobytes()
+    assert formatter.tile_cache.hits == len(party)
+
+    # Swap one party member for a box mon: one new card
+    formatter.format_image(party[:-1] + box[:1])
+    assert formatter.tile_cache.misses == len(party) + 1
+    assert formatter.tile_cache.hits == 2 * len(party) - 1
+
+
+def test_missing_sprites_are_reported(formatter, mons, tmp_path):
+    party, _ = mons
+
+    formatter.format_image(party)
+    assert formatter.missing_sprites == []
+
+    formatter.sprite_store = SpriteStore(tmp_path / "empty", allow_network=False)
+    formatter.sprite_atlas = SpriteAtlas(tmp_path / "none.npy", tmp_path / "none.npy")
+    formatter.tile_cache.clear()
+    formatter.format_image(party)
+    assert formatter.missing_sprites == [mon.species_id for mon in party]
@@ -0,0 +1,49 @@
+import add_src  # noqa
+from pathlib import Path
+import numpy as np
+from PIL import Image, ImageDraw
+from text_layout import (
+    LABEL_COLOR,
+    STAT_COLORS,
+    TEXT_COLOR,
+    TextLayout,
+    load_font,
+    segment_line,
+)
+
+FONT_PATH = str(Path(__file__).parent.parent / "fonts" / "pixeloperator.ttf")
+
+
+def test_segment_ev_line():
+    font = load_font(FONT_PATH, 16)
+    segments = segment_line("EVs: 252 HP / 4 Def", font)
+
+    assert [(text, color) for _, text, color in segments] == [
+        ("EVs:", LABEL_COLOR),
+        ("252 HP", STAT_COLORS["HP"]),
+        (" / ", TEXT_COLOR),
+        ("4 Def", STAT_COLORS["Def"]),
+    ]
+    assert segments[1][0] == font.getlength("EVs: ")
+
+
+def test_cached_line_matches_direct_draw():
+    font = load_font(FONT_PATH, 16)
+    layout = TextLayout(FONT_PATH, 16)
+    line = "Ability: Shield Dust"
+
+    expected = Image.new("RGBA", (200, 40), (18, 18, 18, 255))
+    draw = ImageDraw.Draw(expected)
+    draw.text((5, 7), "Ability:", font=font, fill=LABEL_COLOR)
+    draw.text(
+        (5 + font.getlength("Ability:"), 7), " Shield Dust", font=font, fill=TEXT_COLOR
+    )
+
+    for _ in range(2):
+        canvas = Image.new("RGBA", (200, 40), (18, 18, 18, 255))
+        advance = layout.draw_line(canvas, (5, 7), line)
+
+        assert np.array_equal(np.array(canvas), np.array(expected))
+        assert advance == font.getbbox(line)[3] + 2
+
+    assert layout.lines.hits == 1
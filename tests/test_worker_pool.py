@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import pytest
+import add_src  # noqa
+from pathlib import Path
+from api.workers import PoolBusy, WorkerPool, parse_upload
+
+SAV_PATH = Path(__file__).parent.parent / "sav" / "hijak.sav"
+
+
+def test_full_queue_is_rejected():
+    release = threading.Event()
+
+    async def scenario():
+        pool = WorkerPool(kind="thread", workers=1, queue_size=1)
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(PoolBusy):
+            await pool.run(release.wait)
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        assert pool.stats["pending"] == 0
+        assert pool.stats["rejected"] == 1
+        pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_jobs_run_on_the_pool():
+    async def scenario():
+        pool = WorkerPool(kind="thread", workers=2)
+        result = await pool.run(parse_upload, SAV_PATH.read_bytes())
+        pool.shutdown()
+        return result
+
+    result = asyncio.run(scenario())
+    assert len(result["party"]) == 6
+    assert len(result["box"]) == 55
+
+
+def test_unknown_worker_kind():
+    with pytest.raises(ValueError):
+        WorkerPool(kind="fiber")
+
+
+def test_batch_reports_errors_per_job():
+    async def scenario():
+        pool = WorkerPool(kind="thread", workers=2, queue_size=0)
+        jobs = [(SAV_PATH.read_bytes(),), (b"not a save",), (SAV_PATH.read_bytes(),)]
+        results = [item async for item in pool.run_batch(parse_upload, jobs)]
+        pool.shutdown()
+        return pool, results
+
+    pool, results = asyncio.run(scenario())
+    results.sort(key=lambda item: item[0])
+
+    assert [index for index, _, _ in results] == [0, 1, 2]
+    assert isinstance(results[1][2], ValueError)
+    assert results[0][1] == results[2][1]
+    assert len(results[0][1]["party"]) == 6
+    # Batched jobs wait for a slot rather than being rejected
+    assert pool.stats["rejected"] == 0
+
+
+def test_cancelled_job_keeps_its_slot_until_it_finishes():
+    release = threading.Event()
+
+    async def scenario():
+        pool = WorkerPool(kind="thread", workers=1, queue_size=0)
+        running = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+
+        # The caller gives up, e.g. the client disconnected, but the job
+        # is still running on the pool
+        running.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await running
+        try:
+            assert pool.stats["pending"] == 1
+            with pytest.raises(PoolBusy):
+                await pool.run(release.wait)
+        finally:
+            release.set()
+
+        assert await pool.run(release.wait, wait=True)
+        assert pool.stats["pending"] == 0
+        pool.shutdown()
+
+    asyncio.run(scenario())